@@ -1,14 +1,19 @@
+import numpy as np
 import pandas as pd
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 from calendar import monthrange
-from typing import Optional
+from typing import Optional, Union
 import logging
-from portfolio_manager.LoanValuation import LoanValuation
+from portfolio_manager.LoanValuation import LoanValuation, TreasuryRateArrays
 from portfolio_manager.date_utils import ensure_end_of_month
 
 
 class Loan:
+    # Numeric fields of each monthly schedule entry, in column order
+    SCHEDULE_FIELDS = ('beginning_balance', 'loan_draw', 'loan_paydown', 'interest_payment',
+                       'scheduled_principal_payment', 'ending_balance', 'encumbered')
+
     def __init__(self,
                  id: str,
                  loan_amount: float,
@@ -125,11 +130,8 @@ class Loan:
         self.adjust_unfunded_schedule()
 
     def calculate_interest(self, balance: float, start_date: date, end_date: date) -> float:
-        date_delta = (end_date - start_date).days
-        payment_type_numerators = {'Actual/360': date_delta, '30/360': 30, 'Actual/365': date_delta}
-        payment_type_denominators = {'Actual/360': 360, '30/360': 360, 'Actual/365': 365}
-        payment_type_numerator = payment_type_numerators[self.payment_type]
-        payment_type_denominator = payment_type_denominators[self.payment_type]
+        payment_type_numerator = 30 if self.payment_type == '30/360' else (end_date - start_date).days
+        payment_type_denominator = 365 if self.payment_type == 'Actual/365' else 360
         return balance * self.rate * payment_type_numerator / payment_type_denominator
 
     def calculate_amortizing_payment(self, loan_balance):
@@ -254,10 +256,22 @@ class Loan:
         prior_key = self.fund_date
         prepayment_done = False
 
-        for i, key in enumerate(self.schedule.keys()):
+        # Day counts for every accrual period, computed once for the schedule instead of per month.
+        # Interest is only accrued after a normal period, so the prior key is always the previous month.
+        month_keys = list(self.schedule.keys())
+        if self.payment_type == '30/360':
+            accrual_days = [30] * len(month_keys)
+        else:
+            accrual_days = [0] + np.diff(np.array(month_keys, dtype='datetime64[D]')).astype(np.int64).tolist()
+        day_count_basis = 365 if self.payment_type == 'Actual/365' else 360
+        get_draw = self.loan_draws.get
+        get_paydown = self.loan_paydowns.get
+
+        for i, key in enumerate(month_keys):
+            row = self.schedule[key]
             # Foreclosure Check
             if self.foreclosure_date and key >= self.foreclosure_date:
-                self.schedule[key].update({
+                row.update({
                     'beginning_balance': 0,
                     'loan_draw': 0,
                     'loan_paydown': 0,
@@ -270,16 +284,16 @@ class Loan:
 
             # Initialize first period
             if i == 0:
-                self.schedule[key]['beginning_balance'] = 0
-                self.schedule[key]['loan_draw'] = self.loan_amount  # Loan draw on funding date
-                self.schedule[key]['loan_paydown'] = self.get_loan_paydown(key)
-                self.schedule[key]['interest_payment'] = 0
-                self.schedule[key]['scheduled_principal_payment'] = 0
-                self.schedule[key]['ending_balance'] = self.loan_amount - self.schedule[key]['loan_paydown']
+                row['beginning_balance'] = 0
+                row['loan_draw'] = self.loan_amount  # Loan draw on funding date
+                row['loan_paydown'] = get_paydown(key, 0)
+                row['interest_payment'] = 0
+                row['scheduled_principal_payment'] = 0
+                row['ending_balance'] = self.loan_amount - row['loan_paydown']
             else:
                 # Zero out all cash flows after prepayment is done and balance is zero
                 if prepayment_done and self.schedule[prior_key]['ending_balance'] <= 0:
-                    self.schedule[key].update({
+                    row.update({
                         'beginning_balance': 0,
                         'loan_draw': 0,
                         'loan_paydown': 0,
@@ -292,37 +306,35 @@ class Loan:
 
                 # Normal Loan Calculations Before Prepayment or Full Amortization
                 beginning_balance = self.schedule[prior_key]['ending_balance']
-                self.schedule[key]['beginning_balance'] = max(0, beginning_balance)
-                self.schedule[key]['loan_draw'] = self.get_loan_draw(key)
-                self.schedule[key]['loan_paydown'] = self.get_loan_paydown(key)
+                row['beginning_balance'] = max(0, beginning_balance)
+                row['loan_draw'] = get_draw(key, 0)
+                row['loan_paydown'] = get_paydown(key, 0)
 
                 # Calculate interest
-                self.schedule[key]['interest_payment'] = self.calculate_interest(
-                    self.schedule[key]['beginning_balance'], prior_key, key
-                )
+                row['interest_payment'] = row['beginning_balance'] * self.rate * accrual_days[i] / day_count_basis
 
                 # Scheduled Principal Payment (Only if Amortizing)
                 if self.amortizing_periods > 0 and i > self.interest_only_periods:
                     scheduled_principal = max(
-                        0, self.amortizing_payment - self.schedule[key]['interest_payment']
+                        0, self.amortizing_payment - row['interest_payment']
                     )
                     # Avoid overpaying past zero balance
                     scheduled_principal = min(
-                        scheduled_principal, self.schedule[key]['beginning_balance']
+                        scheduled_principal, row['beginning_balance']
                     )
-                    self.schedule[key]['scheduled_principal_payment'] = scheduled_principal
+                    row['scheduled_principal_payment'] = scheduled_principal
                 else:
-                    self.schedule[key]['scheduled_principal_payment'] = 0
+                    row['scheduled_principal_payment'] = 0
 
                 # Prepayment Check Without Double-Counting Scheduled Principal
                 if self.prepayment_date and key == self.prepayment_date and not prepayment_done:
                     # Calculate prepayment amount after applying scheduled principal payment
                     prepayment_amount = max(
-                        0, self.schedule[key]['beginning_balance'] -
-                           self.schedule[key]['scheduled_principal_payment']
+                        0, row['beginning_balance'] -
+                           row['scheduled_principal_payment']
                     )
                     # Directly set the paydown without calling add_loan_paydown
-                    allowable_paydown = self.schedule[key]['beginning_balance'] + self.schedule[key]['loan_draw']
+                    allowable_paydown = row['beginning_balance'] + row['loan_draw']
                     if prepayment_amount > allowable_paydown:
                         self.logger.warning(
                             f"Attempted prepayment of {prepayment_amount:.2f} on {key} exceeds the allowable amount of {allowable_paydown:.2f}. "
@@ -330,17 +342,17 @@ class Loan:
                         )
                         prepayment_amount = allowable_paydown
                     self.loan_paydowns[key] = prepayment_amount
-                    self.schedule[key]['loan_paydown'] = prepayment_amount
+                    row['loan_paydown'] = prepayment_amount
                     prepayment_done = True
 
                 # Apply maturity paydown if the loan matures and prepayment hasn't been done
                 if key == self.maturity_date and not prepayment_done:
                     maturity_paydown = max(
-                        0, self.schedule[key]['beginning_balance'] -
-                           self.schedule[key]['scheduled_principal_payment']
+                        0, row['beginning_balance'] -
+                           row['scheduled_principal_payment']
                     )
                     # Directly set the paydown without calling add_loan_paydown
-                    allowable_paydown = self.schedule[key]['beginning_balance'] + self.schedule[key]['loan_draw']
+                    allowable_paydown = row['beginning_balance'] + row['loan_draw']
                     if maturity_paydown > allowable_paydown:
                         self.logger.warning(
                             f"Attempted maturity paydown of {maturity_paydown:.2f} on {key} exceeds the allowable amount of {allowable_paydown:.2f}. "
@@ -348,24 +360,32 @@ class Loan:
                         )
                         maturity_paydown = allowable_paydown
                     self.loan_paydowns[key] = maturity_paydown
-                    self.schedule[key]['loan_paydown'] = maturity_paydown
+                    row['loan_paydown'] = maturity_paydown
 
                 # Update ending balance
-                self.schedule[key]['ending_balance'] = max(
-                    0, self.schedule[key]['beginning_balance'] +
-                       self.schedule[key]['loan_draw'] -
-                       self.schedule[key]['loan_paydown'] -
-                       self.schedule[key]['scheduled_principal_payment']
+                row['ending_balance'] = max(
+                    0, row['beginning_balance'] +
+                       row['loan_draw'] -
+                       row['loan_paydown'] -
+                       row['scheduled_principal_payment']
                 )
 
             prior_key = key
 
         return self.schedule
 
+    def generate_loan_schedule_arrays(self):
+        """Return the schedule as (dates, values): an object array of month-ends and a float matrix with SCHEDULE_FIELDS columns."""
+        schedule = self.generate_loan_schedule()
+        dates = np.array(list(schedule.keys()), dtype=object)
+        values = np.array([[entry[field] for field in self.SCHEDULE_FIELDS] for entry in schedule.values()],
+                          dtype=np.float64).reshape(len(dates), len(self.SCHEDULE_FIELDS))
+        return dates, values
+
     def generate_loan_schedule_df(self):
-        df = pd.DataFrame.from_dict(self.generate_loan_schedule()).T
-        df.reset_index(inplace=True)
-        df.rename(columns={'index': 'date'}, inplace=True)
+        dates, values = self.generate_loan_schedule_arrays()
+        df = pd.DataFrame(values, columns=list(self.SCHEDULE_FIELDS))
+        df.insert(0, 'date', dates)
         df['fixed_floating'] = self.fixed_floating
         return df
 
@@ -388,12 +408,12 @@ class Loan:
 
         # Calculate present value of cash flows
         market_value = 0.0
-        for _, row in schedule_df.iterrows():
-            cash_flow_date = row['date']
-            interest_payment = row['interest_payment']
-            principal_payment = row['scheduled_principal_payment']
-            loan_draw = row['loan_draw']
-            loan_paydown = row['loan_paydown']
+        for row in schedule_df.itertuples(index=False):
+            cash_flow_date = row.date
+            interest_payment = row.interest_payment
+            principal_payment = row.scheduled_principal_payment
+            loan_draw = row.loan_draw
+            loan_paydown = row.loan_paydown
 
             # Total cash flow for the period: loan draws, interest payments, and principal payments
             cash_flow = interest_payment + principal_payment + loan_paydown - loan_draw
@@ -409,9 +429,12 @@ class Loan:
 
         return market_value
 
-    def value_loan(self, as_of_date, treasury_rates: dict, chatham_style=True):
+    def value_loan(self, as_of_date, treasury_rates: Union[dict, TreasuryRateArrays], chatham_style=True,
+                   loan_schedule: Optional[pd.DataFrame] = None):
         valuer = LoanValuation(self.fund_date_actual, self.rate, treasury_rates)
-        loan_schedule = self.generate_loan_schedule_df()
+        # Callers valuing the same loan repeatedly can pass an already generated schedule
+        if loan_schedule is None:
+            loan_schedule = self.generate_loan_schedule_df()
         max_date = loan_schedule['date'].max()
         if max_date <= as_of_date:
             logging.warning(f"{self.id}: Loan cash flows end before as of date.")
@@ -1,14 +1,32 @@
 from datetime import timedelta, date
-from typing import Optional
+from typing import Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 import requests
 
 
+TreasuryRateArrays = Tuple[np.ndarray, np.ndarray]
+
+
+def build_treasury_rate_arrays(treasury_rates: Union[dict, TreasuryRateArrays]) -> TreasuryRateArrays:
+    """
+    Convert a {date: rate} dict into sorted (datetime64[D] dates, float64 rates) arrays.
+    Arrays that were already built are returned unchanged.
+    """
+    if isinstance(treasury_rates, tuple):
+        return treasury_rates
+    rate_dates = sorted(treasury_rates)
+    dates = np.array(rate_dates, dtype='datetime64[D]')
+    rates = np.array([treasury_rates[d] for d in rate_dates], dtype=np.float64)
+    return dates, rates
+
+
 class LoanValuation:
-    def __init__(self, funding_date: date, note_rate: float, treasury_rates: dict):
+    def __init__(self, funding_date: date, note_rate: float, treasury_rates: Union[dict, TreasuryRateArrays]):
         self.funding_date = funding_date  # Funding date of the loan
         self.note_rate = note_rate  # Loan's note rate at origination
-        self.treasury_rates = treasury_rates  # Cache for storing fetched Treasury rates
+        # Sorted date/rate arrays for nearest-prior lookups
+        self.treasury_dates, self.treasury_values = build_treasury_rate_arrays(treasury_rates)
 
     def get_treasury_rate(self, target_date: date) -> float:
         """
@@ -18,14 +36,10 @@ class LoanValuation:
         Returns:
         - float: The Treasury rate as a decimal (e.g., 0.02 for 2%).
         """
-        # Check if the exact date is cached
-        if target_date in self.treasury_rates:
-            return self.treasury_rates[target_date]
-
-        # If not cached, find the nearest available date before target_date
-        available_dates = sorted(d for d in self.treasury_rates if d <= target_date)
-        if available_dates:
-            return self.treasury_rates[available_dates[-1]]
+        # Find the exact date or the nearest available date before target_date
+        idx = np.searchsorted(self.treasury_dates, np.datetime64(target_date, 'D'), side='right') - 1
+        if idx >= 0:
+            return float(self.treasury_values[idx])
 
         raise ValueError(f"No Treasury rate available for or before {target_date}")
 
@@ -59,13 +73,13 @@ class LoanValuation:
         Calculate the present value of the loan based on future cash flows.
         """
         market_value = 0.0
-        for _, row in schedule_df.iterrows():
-            cash_flow_date = row['date']
+        for row in schedule_df.itertuples(index=False):
+            cash_flow_date = row.date
             cash_flow = (
-                row['interest_payment']
-                + row['scheduled_principal_payment']
-                + row['loan_paydown']
-                - row['loan_draw']
+                row.interest_payment
+                + row.scheduled_principal_payment
+                + row.loan_paydown
+                - row.loan_draw
             )
             months_elapsed = (cash_flow_date.year - as_of_date.year) * 12 + (cash_flow_date.month - as_of_date.month)
             discounted_cash_flow = cash_flow / ((1 + discount_rate / 12) ** months_elapsed)
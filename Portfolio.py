@@ -1,16 +1,39 @@
 from portfolio_manager.Property import Property
 from portfolio_manager.Loan import Loan
+from portfolio_manager.LoanValuation import build_treasury_rate_arrays
 from portfolio_manager.PreferredEquity import PreferredEquity
 from portfolio_manager.CarriedInterest import CarriedInterest, TierParams
-from portfolio_manager.date_utils import ensure_end_of_month
+from portfolio_manager.date_utils import ensure_end_of_month, ensure_end_of_month_series, sum_frames_by_date
 import pandas as pd
 from datetime import date, datetime
-from dateutil.relativedelta import relativedelta
 from calendar import monthrange
 from typing import Optional
 import logging
+import hashlib
+import json
+import os
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# With use_cache, fetched treasury rates are reused from disk for a day before hitting the APIs again
+TREASURY_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.portfolio_manager')
+TREASURY_CACHE_TTL_SECONDS = 24 * 60 * 60
+TREASURY_REQUEST_TIMEOUT_SECONDS = 10
+
+# Identifier columns read as text so pandas never infers (and later re-casts) them as numbers
+SHEET_DTYPES = {
+    'Properties': {'id': str},
+    'Cash Flows': {'id': str},
+    'Secured Loans': {'id': str, 'property_id': str},
+    'Unsecured Loans': {'id': str},
+    'Unsecured Loan Flows': {'id': str},
+    'Preferred Equity': {'id': str, 'property_id': str, 'loan_id': str},
+    'Promotes': {'property_id': str, 'property_id_': str},
+}
 
 
 class Portfolio:
@@ -33,6 +56,9 @@ class Portfolio:
         self.drip = {}
         self.treasury_rates = {}
         self.distributions = {}
+        self._sheet_cache = {}
+        self._workbook = None
+        self._http = self._build_http_session()
         self.month_list = self.get_month_list(self.analysis_start_date, self.analysis_end_date)
         #self.fetch_treasury_rates()
         self.fee = 0
@@ -48,6 +74,14 @@ class Portfolio:
             'Industrial': 0.10,
                              }
 
+    @staticmethod
+    def _build_http_session():
+        # Pooled keep-alive connections with a short retry on transient server errors for the rate APIs
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504), allowed_methods=frozenset({'GET'}))
+        session.mount('https://', HTTPAdapter(max_retries=retry))
+        return session
+
     def set_file_path(self, file_path):
         self.file_path = file_path
 
@@ -71,26 +105,20 @@ class Portfolio:
         if start_date > end_date:
             raise ValueError("start_date must be on or before end_date.")
 
-        month_list = []
-        current_date = ensure_end_of_month(start_date)
-
-        while current_date <= end_date:
-            month_list.append(current_date)
-            # Move to the next month
-            current_date = ensure_end_of_month(current_date + relativedelta(months=1))
-
-        return month_list
+        # Month-ends from the start month through end_date, generated in one vectorized call
+        month_ends = pd.date_range(ensure_end_of_month(start_date), end_date, freq='ME')
+        return month_ends.date.tolist()
 
     def calculate_unfunded_commitments(self):
-        for i, month in enumerate(self.month_list):
-            if i==0:
-                self.unfunded_equity[month] = self.initial_unfunded_equity
-            else:
-                prior_month = self.month_list[i-1]
-                unfunded = self.unfunded_equity[prior_month] - self.capital_calls.get(month,0)
-                self.unfunded_equity[month] = unfunded
-                if unfunded < 0:
-                    logging.warning(f"{month}: Capital calls exceed available unfunded commitments -- Unfunded: ${unfunded:,.0f}.")
+        # The first month carries the initial commitment; later capital calls draw it down cumulatively
+        calls = np.fromiter((self.capital_calls.get(month, 0) for month in self.month_list),
+                            dtype=np.float64, count=len(self.month_list))
+        if len(calls) > 0:
+            calls[0] = 0
+        unfunded = self.initial_unfunded_equity - np.cumsum(calls)
+        self.unfunded_equity.update(zip(self.month_list, unfunded.tolist()))
+        for i in np.flatnonzero(unfunded < 0):
+            logging.warning(f"{self.month_list[i]}: Capital calls exceed available unfunded commitments -- Unfunded: ${unfunded[i]:,.0f}.")
         return self.unfunded_equity
 
     def get_unfunded_commitments_df(self):
@@ -106,43 +134,57 @@ class Portfolio:
         return pd.DataFrame(loan_capital,columns=['Property Name','loan_capital'])
 
     def load_data(self):
-        self.load_properties()
-        self.load_cash_flows()
-        self.load_property_loans()
-        self.load_unsecured_loans()
-        self.load_unsecured_loan_flows()
-        self.load_capital_flows()
-        for property in self.properties.values():
-            property.calculate_unfunded_equity()
-            property.set_treasury_rates(self.treasury_rates)
-        self.load_preferred_equity()
-        self.calculate_unfunded_commitments()
-        self.load_promotes()
-        self.load_promote_cash_flows()
+        # Open the workbook once so each sheet read reuses the parsed archive; parsed sheets live only for this call
+        self._sheet_cache = {}
+        self._workbook = pd.ExcelFile(self.file_path)
+        try:
+            self.load_properties()
+            self.load_cash_flows()
+            self.load_property_loans()
+            self.load_unsecured_loans()
+            self.load_unsecured_loan_flows()
+            self.load_capital_flows()
+            for property in self.properties.values():
+                property.calculate_unfunded_equity()
+                property.set_treasury_rates(self.treasury_rates)
+            self.load_preferred_equity()
+            self.calculate_unfunded_commitments()
+            self.load_promotes()
+            self.load_promote_cash_flows()
+        finally:
+            self._workbook.close()
+            self._workbook = None
+            self._sheet_cache = {}
 
 
 
     def read_import_file(self, sheet_name, use_cols: Optional[list] = None):
+        # Within load_data each sheet is parsed once and loaders reading different columns slice the cached frame;
+        # outside it every call rereads the file, so edits to the workbook are always picked up
+        df = self._sheet_cache.get(sheet_name)
+        if df is None:
+            source = self._workbook if self._workbook is not None else self.file_path
+            df = pd.read_excel(source, sheet_name=sheet_name, dtype=SHEET_DTYPES.get(sheet_name, {'id': str}))
+            date_columns = ['acquisition_date', 'disposition_date', 'date', 'fund_date', 'maturity_date', 'prepayment_date','foreclosure_date']  # Replace with your actual date column names
+            for col in date_columns:
+                if col in df.columns:
+                    df[col] = pd.to_datetime(df[col]).dt.date
+            if self._workbook is not None:
+                self._sheet_cache[sheet_name] = df
         if use_cols is not None:
-            df = pd.read_excel(self.file_path, sheet_name=sheet_name, dtype={'id': str, 'property_id': str,'property_id_':str}, usecols=use_cols)
-        else:
-            df = pd.read_excel(self.file_path, sheet_name=sheet_name, dtype={'id': str})
-        date_columns = ['acquisition_date', 'disposition_date', 'date', 'fund_date', 'maturity_date', 'prepayment_date','foreclosure_date']  # Replace with your actual date column names
-        for col in date_columns:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col]).dt.date
-        return df
+            return df[use_cols].copy()
+        return df.copy()
 
 
     def load_preferred_equity(self, df: Optional[pd.DataFrame] = None):
         if df is None:
             df = self.read_import_file('Preferred Equity')
         df['id'] = df['id'].fillna('').astype(str)
-        for i, row in df.iterrows():
-            id = row['id']
-            property_id = str(row['property_id'])
-            loan_id = str(row['loan_id'])
-            ownership_share = row['ownership_share']
+        for row in df.itertuples(index=False):
+            id = row.id
+            property_id = str(row.property_id)
+            loan_id = str(row.loan_id)
+            ownership_share = row.ownership_share
             property = self.get_property(property_id)
             loan = property.get_loan(loan_id)
             preferred_equity = PreferredEquity(id, loan, ownership_share)
@@ -153,15 +195,15 @@ class Portfolio:
             df = self.read_import_file('Promotes', use_cols=['property_id', 'tier_number', 'hurdle_rate', 'lp_distribution'])
             df = df.sort_values(['property_id','tier_number'], ascending=[1,1])
             df = df.loc[~df.property_id.isna()]
-        for i, row in df.iterrows():
-            property_id = row['property_id']
+        for row in df.itertuples(index=False):
+            property_id = row.property_id
             property = self.get_property(property_id)
-            property.add_promote_tier(TierParams(hurdle_rate=row['hurdle_rate'], lp_dist_ratio=row['lp_distribution']))
+            property.add_promote_tier(TierParams(hurdle_rate=row.hurdle_rate, lp_dist_ratio=row.lp_distribution))
     def load_promote_cash_flows(self, df: Optional[pd.DataFrame] = None):
         if df is None:
             # Read the data with specific columns
             df = self.read_import_file('Promotes', use_cols=['property_id_', 'date', 'cash_flow'])
-            df['date'] = df['date'].apply(lambda x: ensure_end_of_month(x))
+            df['date'] = ensure_end_of_month_series(df['date'])
             #print(df.columns)
         # Ensure the DataFrame has the required columns
         required_columns = {'property_id_', 'date', 'cash_flow'}
@@ -189,41 +231,44 @@ class Portfolio:
             df = self.read_import_file('Properties')
         df['id'] = df['id'].fillna('').astype(str)
         #df = pd.read_excel(self.file_path, sheet_name='Properties', dtype={'id':str})
-        for i,row in df.iterrows():
+        # Roll the event dates to month-end column-wise so the loop only constructs properties
+        for col in ['acquisition_date', 'disposition_date', 'construction_end', 'partner_buyout_date', 'partial_sale_date']:
+            df[col] = ensure_end_of_month_series(df[col])
+        for row in df.itertuples(index=False):
             self.add_property(
                 Property(
-                    id=row['id'],
-                    name=row['name'],
-                    property_type=row['property_type'],
-                    acquisition_date=ensure_end_of_month(row['acquisition_date']),
-                    disposition_date=ensure_end_of_month(row['disposition_date']),
-                    acquisition_cost=row['acquisition_cost'],
-                    disposition_price=row['disposition_price'],
-                    address=row['address'],
-                    city=row['city'],
-                    state=row['state'],
-                    zipcode=row['zipcode'],
-                    building_size=row['building_size'],
-                    market_value=row['market_value'],
-                    analysis_date=row['analysis_date'],
-                    analysis_length=row['analysis_length'],
+                    id=row.id,
+                    name=row.name,
+                    property_type=row.property_type,
+                    acquisition_date=row.acquisition_date,
+                    disposition_date=row.disposition_date,
+                    acquisition_cost=row.acquisition_cost,
+                    disposition_price=row.disposition_price,
+                    address=row.address,
+                    city=row.city,
+                    state=row.state,
+                    zipcode=row.zipcode,
+                    building_size=row.building_size,
+                    market_value=row.market_value,
+                    analysis_date=row.analysis_date,
+                    analysis_length=row.analysis_length,
                     loans = {},
-                    market_value_growth=row['market_value_growth'],
-                    ownership=row['ownership'],
-                    construction_end=ensure_end_of_month(row['construction_end']),
-                    equity_commitment=row['equity_commitment'],
-                    partner_buyout_cost=row['partner_buyout_cost'],
-                    partner_buyout_date=ensure_end_of_month(row['partner_buyout_date']),
-                    partner_buyout_percent=row['partner_buyout_percent'],
-                    partial_sale_date=ensure_end_of_month(row['partial_sale_date']),
-                    partial_sale_percent=row['partial_sale_percent'],
-                    partial_sale_proceeds=row['partial_sale_proceeds'],
-                    encumbered=row['encumbered'],
-                    cap_rate=row['cap_rate'],
-                    exit_cap_rate=row['exit_cap_rate'],
-                    capex_percent_of_noi=row['capex_percent_of_noi'],
-                    promote=row['promote'],
-                    upper_tier_share = row['upper_tier_share'] if not pd.isna(row['upper_tier_share']) else None
+                    market_value_growth=row.market_value_growth,
+                    ownership=row.ownership,
+                    construction_end=row.construction_end,
+                    equity_commitment=row.equity_commitment,
+                    partner_buyout_cost=row.partner_buyout_cost,
+                    partner_buyout_date=row.partner_buyout_date,
+                    partner_buyout_percent=row.partner_buyout_percent,
+                    partial_sale_date=row.partial_sale_date,
+                    partial_sale_percent=row.partial_sale_percent,
+                    partial_sale_proceeds=row.partial_sale_proceeds,
+                    encumbered=row.encumbered,
+                    cap_rate=row.cap_rate,
+                    exit_cap_rate=row.exit_cap_rate,
+                    capex_percent_of_noi=row.capex_percent_of_noi,
+                    promote=row.promote,
+                    upper_tier_share = row.upper_tier_share if not pd.isna(row.upper_tier_share) else None
                 )
             )
         return df
@@ -234,48 +279,33 @@ class Portfolio:
 
         # Ensure proper data types and valid dates
         df['id'] = df['id'].fillna('').astype(str)
-        df['date'] = df['date'].apply(lambda x: ensure_end_of_month(x))
+        df['date'] = ensure_end_of_month_series(df['date'])
 
-        # Iterate through properties and update their cash flows
-        for prop_id, property in self.properties.items():
-            # Create dictionaries for cash flows ensuring dates are date objects
-            noi = dict(zip(
-                df.loc[(df['cash_flow'] == 'noi') & (df['id'] == prop_id), 'date'].apply(ensure_end_of_month),
-                df.loc[(df['cash_flow'] == 'noi') & (df['id'] == prop_id), 'amount']
-            ))
-
-            capex = dict(zip(
-                df.loc[(df['cash_flow'] == 'capex') & (df['id'] == prop_id), 'date'].apply(ensure_end_of_month),
-                df.loc[(df['cash_flow'] == 'capex') & (df['id'] == prop_id), 'amount']
-            ))
+        # Build {date: amount} dicts for every (cash flow, property) pair in a single pass
+        cash_flows = {
+            key: dict(zip(group['date'], group['amount']))
+            for key, group in df.groupby(['cash_flow', 'id'], sort=False)
+        }
 
-            # Update the properties with cash flows
-            property.update_noi(noi)
-            property.update_capex(capex)
+        # Update the properties with cash flows
+        for prop_id, property in self.properties.items():
+            property.update_noi(cash_flows.get(('noi', prop_id), {}))
+            property.update_capex(cash_flows.get(('capex', prop_id), {}))
 
     def load_capital_flows(self, df: Optional[pd.DataFrame] = None):
         if df is None:
             df = self.read_import_file('Capital Flows')
-        df['date'] = df['date'].apply(lambda x: ensure_end_of_month(x))
-        capital_calls = dict(zip(
-            df.loc[(df['cash_flow'] == 'capital call'), 'date'].apply(ensure_end_of_month),
-            df.loc[(df['cash_flow'] == 'capital call'), 'amount']
-        ))
-
-        redemptions = dict(zip(
-            df.loc[(df['cash_flow'] == 'redemption'), 'date'].apply(ensure_end_of_month),
-            df.loc[(df['cash_flow'] == 'redemption'), 'amount']
-        ))
-
-        drip = dict(zip(
-            df.loc[(df['cash_flow'] == 'drip'), 'date'].apply(ensure_end_of_month),
-            df.loc[(df['cash_flow'] == 'drip'), 'amount']
-        ))
-
-        distributions = dict(zip(
-            df.loc[(df['cash_flow'] == 'distribution'), 'date'].apply(ensure_end_of_month),
-            df.loc[(df['cash_flow'] == 'distribution'), 'amount']
-        ))
+        df['date'] = ensure_end_of_month_series(df['date'])
+
+        # Build {date: amount} dicts for every flow type in a single pass
+        flows = {
+            cash_flow: dict(zip(group['date'], group['amount']))
+            for cash_flow, group in df.groupby('cash_flow', sort=False)
+        }
+        capital_calls = flows.get('capital call', {})
+        redemptions = flows.get('redemption', {})
+        drip = flows.get('drip', {})
+        distributions = flows.get('distribution', {})
         self.capital_calls = capital_calls
         self.redemptions = redemptions
         self.distributions = distributions
@@ -291,53 +321,55 @@ class Portfolio:
         df['id'] = df['id'].fillna('').astype(str)
         df['property_id'] = df['property_id'].fillna('').astype(str)
 
-        for _, row in df.iterrows():
+        attached = 0
+        for row in df.itertuples(index=False):
             # Create Loan instance
-            #print(row['id'])
+            #print(row.id)
             loan = Loan(
-                id=row['id'],
-                property_id=row['property_id'],
-                loan_amount=row['loan_amount'],
-                rate=row['rate'],
-                fund_date=row['fund_date'],
-                maturity_date=row['maturity_date'],
-                payment_type=row['payment_type'],
-                interest_only_periods=row['interest_only_periods'],
-                amortizing_periods=row['amortizing_periods'],
-                commitment=row['commitment'],
-                prepayment_date=row['prepayment_date'],
-                foreclosure_date=row['foreclosure_date'],
-                market_rate=row['market_rate'],
-                fixed_floating=row['fixed_floating'],
+                id=row.id,
+                property_id=row.property_id,
+                loan_amount=row.loan_amount,
+                rate=row.rate,
+                fund_date=row.fund_date,
+                maturity_date=row.maturity_date,
+                payment_type=row.payment_type,
+                interest_only_periods=row.interest_only_periods,
+                amortizing_periods=row.amortizing_periods,
+                commitment=row.commitment,
+                prepayment_date=row.prepayment_date,
+                foreclosure_date=row.foreclosure_date,
+                market_rate=row.market_rate,
+                fixed_floating=row.fixed_floating,
             )
 
             # Add loan to the corresponding property
-            for property_id, property_ in self.properties.items():
-                if loan.property_id == property_id:
-                    property_.add_loan(loan)
-                    logging.debug(f"Adding loan with ID {loan.id} to property {row['property_id']}")
+            property_ = self.properties.get(loan.property_id)
+            if property_ is not None:
+                property_.add_loan(loan)
+                attached += 1
+        logging.debug("Attached %d of %d secured loans to properties", attached, len(df))
 
     def load_unsecured_loans(self, df: Optional[pd.DataFrame] = None):
         if df is None:
             df = self.read_import_file('Unsecured Loans')
         df['id'] = df['id'].fillna('').astype(str)
 
-        for _, row in df.iterrows():
+        for row in df.itertuples(index=False):
             # Create Loan instance
             loan = Loan(
-                id=row['id'],
-                loan_amount=row['loan_amount'],
-                rate=row['rate'],
-                fund_date=row['fund_date'],
-                maturity_date=row['maturity_date'],
-                payment_type=row['payment_type'],
-                interest_only_periods=row['interest_only_periods'],
-                amortizing_periods=row['amortizing_periods'],
-                commitment=row['commitment'],
-                prepayment_date=row['prepayment_date'],
-                foreclosure_date=row['foreclosure_date'],
-                market_rate=row['market_rate'],
-                fixed_floating=row['fixed_floating'],
+                id=row.id,
+                loan_amount=row.loan_amount,
+                rate=row.rate,
+                fund_date=row.fund_date,
+                maturity_date=row.maturity_date,
+                payment_type=row.payment_type,
+                interest_only_periods=row.interest_only_periods,
+                amortizing_periods=row.amortizing_periods,
+                commitment=row.commitment,
+                prepayment_date=row.prepayment_date,
+                foreclosure_date=row.foreclosure_date,
+                market_rate=row.market_rate,
+                fixed_floating=row.fixed_floating,
             )
 
             self.add_loan(loan)
@@ -347,14 +379,15 @@ class Portfolio:
             df = self.read_import_file('Unsecured Loan Flows')
         df['id'] = df['id'].fillna('').astype(str)
 
-        # Sort flows by date to ensure sequential processing
+        # Sort flows by date to ensure sequential processing, then roll the dates to month-end in one pass
         df = df.sort_values(by=['date', 'id', 'flow_type'])
+        df['date'] = ensure_end_of_month_series(df['date'])
 
-        for _, row in df.iterrows():
-            loan_id = row['id']
-            flow_type = row['flow_type']
-            date_ = ensure_end_of_month(row['date'])
-            amount = row['amount']
+        for row in df.itertuples(index=False):
+            loan_id = row.id
+            flow_type = row.flow_type
+            date_ = row.date
+            amount = row.amount
 
             # Sequentially apply draws and paydowns
             if flow_type == 'draw':
@@ -457,21 +490,55 @@ class Portfolio:
         df['encumbered'] = False
         return df
 
+    @staticmethod
+    def _balance_as_of(loan, loan_schedule, as_of_date):
+        # Scheduled ending balance on as_of_date, or None (with a warning) when the loan cannot be valued then
+        # Schedules run in date order, so the last date bounds them and a binary search finds the row
+        dates = loan_schedule['date'].to_numpy()
+        if dates[-1] <= as_of_date:
+            logging.warning(f"{loan.id}: Loan cash flows end before as of date.")
+            return None
+        position = np.searchsorted(dates, as_of_date)
+        if dates[position] != as_of_date:
+            logging.warning(f"{loan.id}: No scheduled balance on {as_of_date}.")
+            return None
+        return loan_schedule['ending_balance'].iat[position]
+
+    @staticmethod
+    def _concat_tagged(schedules, ids, id_column):
+        # Tag each schedule with its id, stack them once, then move the id column to the front
+        df = pd.concat([schedule.assign(**{id_column: id_}) for schedule, id_ in zip(schedules, ids)],
+                       ignore_index=True, sort=False)
+        return df[[id_column] + [column for column in df.columns if column != id_column]]
+
+    @staticmethod
+    def _stack_frames(frames):
+        # Frames sharing one plain-NumPy schema are stacked column by column; mixed schemas need pd.concat's alignment
+        first = frames[0]
+        same_schema = all(
+            frame.columns.equals(first.columns) and frame.dtypes.equals(first.dtypes) for frame in frames[1:]
+        )
+        if same_schema and first.columns.is_unique and all(isinstance(dtype, np.dtype) for dtype in first.dtypes):
+            return pd.DataFrame({
+                column: np.concatenate([frame[column].to_numpy() for frame in frames]) for column in first.columns
+            })
+        return pd.concat(frames, ignore_index=True, sort=False)
+
     def combine_loan_schedules_df(self):
         loans_ = [loan.generate_loan_schedule_df() for loan in self.loans.values()]
-        df = pd.concat(loans_)
-        df = df.groupby('date').sum().reset_index()
+        df = sum_frames_by_date(loans_)
         df['encumbered'] = False
         return df
 
     def concat_loan_schedules_df(self):
-        loans_ = []
-        for loan in self.loans.values():
-            df = loan.generate_loan_schedule_df()
-            df['loan_id'] = loan.id
-            cols = df.columns[-1:].append(df.columns[:-1])
-            loans_.append(df[cols])
-        df = pd.concat(loans_)
+        # Stack every loan's schedule arrays once and build a single frame, rather than one frame per loan
+        loans = list(self.loans.values())
+        schedules = [loan.generate_loan_schedule_arrays() for loan in loans]
+        lengths = [len(dates) for dates, _ in schedules]
+        df = pd.DataFrame(np.concatenate([values for _, values in schedules]), columns=list(Loan.SCHEDULE_FIELDS))
+        df.insert(0, 'date', np.concatenate([dates for dates, _ in schedules]))
+        df.insert(0, 'loan_id', np.repeat(np.array([loan.id for loan in loans], dtype=object), lengths))
+        df['fixed_floating'] = np.repeat(np.array([loan.fixed_floating for loan in loans], dtype=object), lengths)
         df['encumbered'] = False
         return df
 
@@ -480,14 +547,10 @@ class Portfolio:
             logging.info("No preferred equity to process.")
             return pd.DataFrame(columns=['date', 'preferred_equity_id', 'encumbered'])  # Adjust columns as needed
 
-        preferred_equities = []
-        for preferred_equity in self.preferred_equity.values():
-            df = preferred_equity.generate_preferred_equity_schedule_df()
-            df['preferred_equity_id'] = preferred_equity.id
-            cols = df.columns[-1:].append(df.columns[:-1])
-            preferred_equities.append(df[cols])
-
-        return pd.concat(preferred_equities)
+        schedules = [preferred_equity.generate_preferred_equity_schedule_df()
+                     for preferred_equity in self.preferred_equity.values()]
+        return self._concat_tagged(
+            schedules, [preferred_equity.id for preferred_equity in self.preferred_equity.values()], 'preferred_equity_id')
 
     def concat_preferred_equity_schedules_share_df(self):
         if not self.preferred_equity:  # No preferred equity
@@ -495,33 +558,25 @@ class Portfolio:
             return pd.DataFrame(
                 columns=['date', 'preferred_equity_id', 'ownership_share', 'encumbered'])  # Adjust columns
 
-        preferred_equities = []
-        for preferred_equity in self.preferred_equity.values():
-            df = preferred_equity.get_preferred_equity_schedule_share_df_by_date(self.analysis_start_date, self.analysis_end_date)
-            df['preferred_equity_id'] = preferred_equity.id
-            cols = df.columns[-1:].append(df.columns[:-1])
-            preferred_equities.append(df[cols])
-
-        return pd.concat(preferred_equities)
+        schedules = [preferred_equity.get_preferred_equity_schedule_share_df_by_date(self.analysis_start_date, self.analysis_end_date)
+                     for preferred_equity in self.preferred_equity.values()]
+        return self._concat_tagged(
+            schedules, [preferred_equity.id for preferred_equity in self.preferred_equity.values()], 'preferred_equity_id')
 
 
     def concat_property_cash_flows(self):
-        property_cash_flows = pd.concat([
-            property.combine_loan_cash_flows_df()
-            for property in list(self.properties.values()
-                                 )])
+        property_cash_flows = self._stack_frames([property.combine_loan_cash_flows_df() for property in self.properties.values()])
         property_cash_flows['date'] = pd.to_datetime(property_cash_flows['date']).dt.date
-        cols = list(property_cash_flows.columns[-2:].append(property_cash_flows.columns[0:-2]))
+        columns = list(property_cash_flows.columns)
+        cols = columns[-2:] + columns[:-2]
         property_cash_flows = property_cash_flows.fillna(0)
         return property_cash_flows[cols]
 
     def concat_property_cash_flows_at_share(self):
-        property_cash_flows = pd.concat([
-            property.adjust_cash_flows_by_ownership_df()
-            for property in list(self.properties.values()
-                                 )])
-        property_cash_flows['date'] = pd.to_datetime(property_cash_flows['date']).dt.date
-        cols = list(property_cash_flows.columns[-3:].append(property_cash_flows.columns[0:-3]))
+        # adjust_cash_flows_by_ownership_df already returns `date` objects, so no conversion is needed
+        property_cash_flows = self._stack_frames([property.adjust_cash_flows_by_ownership_df() for property in self.properties.values()])
+        columns = list(property_cash_flows.columns)
+        cols = columns[-3:] + columns[:-3]
         property_cash_flows = property_cash_flows.fillna(0)
 
         return property_cash_flows[cols]
@@ -534,28 +589,26 @@ class Portfolio:
                 property_loan_cash_flows['Property Name'] = property.name
                 property_loan_cash_flows['Property Type'] = property.property_type
                 schedules.append(property_loan_cash_flows)
-        df = pd.concat(schedules)
+        df = schedules[0] if len(schedules) == 1 else pd.concat(schedules, ignore_index=True, sort=False)
         df = df.fillna(0)
         return df
 
     def concat_property_loan_cash_flows_at_share_with_unsecured_loans(self):
         property_cash_flows = self.concat_property_loan_cash_flows_at_share()
         unsecured_loan_cash_flows = self.concat_loan_schedules_df()
-        unsecured_loan_cash_flows['date'] = pd.to_datetime(unsecured_loan_cash_flows['date']).dt.date
         unsecured_loan_cash_flows.rename(columns={'loan_id': 'Property Name'}, inplace=True)
         unsecured_loan_cash_flows['Property Type'] = 'Fund-Level'
-        portfolio_cash_flows = pd.concat([property_cash_flows, unsecured_loan_cash_flows], axis=0)
+        portfolio_cash_flows = pd.concat([property_cash_flows, unsecured_loan_cash_flows], axis=0, ignore_index=True, sort=False)
         return portfolio_cash_flows
 
     def concat_property_cash_flows_at_share_with_unsecured_loans(self):
         property_cash_flows = self.concat_property_cash_flows_at_share()
         unsecured_loan_cash_flows = self.concat_loan_schedules_df()
         unsecured_loan_cash_flows = unsecured_loan_cash_flows.loc[(unsecured_loan_cash_flows.date >= self.analysis_start_date) & (unsecured_loan_cash_flows.date <= self.analysis_end_date)]
-        unsecured_loan_cash_flows['date'] = pd.to_datetime(unsecured_loan_cash_flows['date']).dt.date
         unsecured_loan_cash_flows.rename(columns={'loan_id':'Property Name'},inplace=True)
         unsecured_loan_cash_flows['Property Type'] = 'Fund-Level'
 
-        portfolio_cash_flows = pd.concat([property_cash_flows, unsecured_loan_cash_flows], axis=0)
+        portfolio_cash_flows = pd.concat([property_cash_flows, unsecured_loan_cash_flows], axis=0, ignore_index=True, sort=False)
         # Handle preferred equity cash flows
         if not self.preferred_equity:
             preferred_equity_cash_flows = pd.DataFrame({
@@ -565,24 +618,25 @@ class Portfolio:
             })
         else:
             preferred_equity_cash_flows = self.concat_preferred_equity_schedules_share_df()
-        portfolio_cash_flows = pd.concat([portfolio_cash_flows, preferred_equity_cash_flows], axis=0)
-        portfolio_cash_flows.fillna(value=0, inplace=True)
+        portfolio_cash_flows = pd.concat([portfolio_cash_flows, preferred_equity_cash_flows], axis=0, ignore_index=True, sort=False)
 
         loan_capital = self.get_loan_capital_df().drop_duplicates(subset=['Property Name'])
         portfolio_cash_flows = portfolio_cash_flows.merge(loan_capital, how='left', on='Property Name')
         portfolio_cash_flows.fillna(value=0, inplace=True)
+        portfolio_cash_flows['encumbered'] = portfolio_cash_flows['encumbered'].astype(bool)
         portfolio_cash_flows['loan_capital'] = portfolio_cash_flows['ownership_share'] * portfolio_cash_flows[
             'loan_capital'] / 12
         portfolio_cash_flows['loan_nii'] = portfolio_cash_flows['noi'] - portfolio_cash_flows['loan_capital']
-        portfolio_cash_flows['encumbered_loan_nii'] = portfolio_cash_flows['loan_nii'] * portfolio_cash_flows['encumbered']
-        portfolio_cash_flows['unencumbered_loan_nii'] = portfolio_cash_flows['loan_nii'] * portfolio_cash_flows['encumbered'].apply(lambda x: x==False)
-        portfolio_cash_flows['encumbered_market_value'] = portfolio_cash_flows['market_value'] * portfolio_cash_flows['encumbered'].apply(lambda x: x == True)
-        portfolio_cash_flows['unencumbered_market_value'] = portfolio_cash_flows['market_value'] * portfolio_cash_flows['encumbered'].apply(lambda x: x == False)
-        portfolio_cash_flows['unsecured_interest_payment'] = portfolio_cash_flows['interest_payment'] * portfolio_cash_flows['Property Type'].apply(lambda x: x=='Fund-Level')
+        # Build the encumbered / fund-level masks once and reuse them for every split
+        encumbered = portfolio_cash_flows['encumbered'].to_numpy()
+        fund_level = (portfolio_cash_flows['Property Type'] == 'Fund-Level').to_numpy()
+        portfolio_cash_flows['encumbered_loan_nii'] = portfolio_cash_flows['loan_nii'].where(encumbered, 0)
+        portfolio_cash_flows['unencumbered_loan_nii'] = portfolio_cash_flows['loan_nii'].where(~encumbered, 0)
+        portfolio_cash_flows['encumbered_market_value'] = portfolio_cash_flows['market_value'].where(encumbered, 0)
+        portfolio_cash_flows['unencumbered_market_value'] = portfolio_cash_flows['market_value'].where(~encumbered, 0)
+        portfolio_cash_flows['unsecured_interest_payment'] = portfolio_cash_flows['interest_payment'].where(fund_level, 0)
         portfolio_cash_flows['secured_interest_payment'] = portfolio_cash_flows['interest_payment'] - portfolio_cash_flows['unsecured_interest_payment']
-        portfolio_cash_flows['unsecured_debt_balance'] = portfolio_cash_flows['ending_balance'] * \
-                                                             portfolio_cash_flows['Property Type'].apply(
-                                                                 lambda x: x == 'Fund-Level')
+        portfolio_cash_flows['unsecured_debt_balance'] = portfolio_cash_flows['ending_balance'].where(fund_level, 0)
         portfolio_cash_flows['secured_debt_balance'] = portfolio_cash_flows['ending_balance'] - portfolio_cash_flows['unsecured_debt_balance']
 
         columns_order = [
@@ -630,131 +684,106 @@ class Portfolio:
         return portfolio_cash_flows
 
     def combine_portfolio_cash_flows_df(self):
-        property_cash_flows = pd.concat([
-            property.combine_loan_cash_flows_df()
-            for property in list(self.properties.values()
-                                 )])
-        property_cash_flows['date'] = pd.to_datetime(property_cash_flows['date']).dt.date
+        # Property cash flows come back keyed by datetime64; align everything on that and convert to `date` once at the end
+        property_cash_flows = [property.combine_loan_cash_flows_df() for property in self.properties.values()]
 
         unsecured_loan_cash_flows = self.combine_loan_schedules_df()
         unsecured_loan_cash_flows = unsecured_loan_cash_flows.loc[(unsecured_loan_cash_flows.date >= self.analysis_start_date) & (unsecured_loan_cash_flows.date <= self.analysis_end_date)]
-        property_cash_flows['date'] = pd.to_datetime(property_cash_flows['date']).dt.date
-        unsecured_loan_cash_flows['date'] = pd.to_datetime(unsecured_loan_cash_flows['date']).dt.date
-        portfolio_cash_flows = pd.concat([property_cash_flows,unsecured_loan_cash_flows],axis=0)
-        portfolio_cash_flows.fillna(0, inplace=True)
-        portfolio_cash_flows = portfolio_cash_flows.drop(columns=['Property Name', 'Property Type'])
-        portfolio_cash_flows = portfolio_cash_flows.groupby("date").sum().reset_index()
+        unsecured_loan_cash_flows = unsecured_loan_cash_flows.assign(date=pd.to_datetime(unsecured_loan_cash_flows['date']))
+        # Sum the numeric columns date by date without stacking every schedule first
+        portfolio_cash_flows = sum_frames_by_date(property_cash_flows + [unsecured_loan_cash_flows], numeric_only=True)
+        portfolio_cash_flows['date'] = pd.to_datetime(portfolio_cash_flows['date']).dt.date
         portfolio_cash_flows.fillna(value=0, inplace=True)
 
 
         return portfolio_cash_flows
 
+    def get_capital_events_df(self) -> pd.DataFrame:
+        """Fund-level capital flows by date, one column per flow type, with zeros where a type has no flow."""
+        return pd.DataFrame({
+            'capital_calls': self.capital_calls,
+            'drip': self.drip,
+            'redemptions': self.redemptions,
+            'distributions': self.distributions,
+        }, dtype=float).fillna(0)
+
     def get_portfolio_cash_flows_share_df(self):
         portfolio_cash_flows = self.concat_property_cash_flows_at_share_with_unsecured_loans()
 
-        # Group by date and sum cash flows
-        portfolio_cash_flows = portfolio_cash_flows.groupby("date").sum().reset_index()
-
-        # Map capital calls, redemptions, and distributions
-        portfolio_cash_flows['capital_calls'] = portfolio_cash_flows['date'].map(self.capital_calls).fillna(0)
-        portfolio_cash_flows['drip'] = portfolio_cash_flows['date'].map(self.drip).fillna(0)
-        portfolio_cash_flows['redemptions'] = portfolio_cash_flows['date'].map(self.redemptions).fillna(0)
-        portfolio_cash_flows['distributions'] = portfolio_cash_flows['date'].map(self.distributions).fillna(0)
-
-        # Calculate net cash flow
-        portfolio_cash_flows['Net Cash Flow'] = (
-                portfolio_cash_flows['noi'] -
-                portfolio_cash_flows['capex'] -
-                portfolio_cash_flows['acquisition_cost'] +
-                portfolio_cash_flows['disposition_price'] -
-                portfolio_cash_flows['partner_buyout_cost'] +
-                portfolio_cash_flows['partial_sale_proceeds'] +
-                portfolio_cash_flows['loan_draw'] -
-                portfolio_cash_flows['loan_paydown'] -
-                portfolio_cash_flows['interest_payment'] -
-                portfolio_cash_flows['scheduled_principal_payment'] +
-                portfolio_cash_flows['capital_calls'] +
-                portfolio_cash_flows['drip'] -
-                portfolio_cash_flows['redemptions'] -
-                portfolio_cash_flows['distributions'] -
-                portfolio_cash_flows['preferred_equity_draw'] +
-                portfolio_cash_flows['preferred_equity_repayment']
+        # Sum the numeric cash flow columns by date
+        portfolio_cash_flows = sum_frames_by_date([portfolio_cash_flows], numeric_only=True)
+
+        # Restrict to the analysis window before any per-period work
+        portfolio_cash_flows = portfolio_cash_flows.loc[
+            (portfolio_cash_flows.date >= self.analysis_start_date) &
+            (portfolio_cash_flows.date <= self.analysis_end_date)
+            ].reset_index(drop=True)
+
+        # Align capital calls, redemptions, and distributions to the portfolio dates in one reindex
+        capital_events = self.get_capital_events_df().reindex(portfolio_cash_flows['date'].values, fill_value=0)
+        portfolio_cash_flows = portfolio_cash_flows.assign(
+            **{column: capital_events[column].to_numpy() for column in capital_events.columns}
         )
 
-        # Initialize beginning and ending cash columns
-        portfolio_cash_flows['beginning_cash'] = 0.0
-        portfolio_cash_flows['ending_cash'] = 0.0
+        # Calculate net cash flow in a single expression pass (uses numexpr when it is installed)
+        portfolio_cash_flows['Net Cash Flow'] = portfolio_cash_flows.eval(
+            'noi - capex - acquisition_cost + disposition_price - partner_buyout_cost'
+            ' + partial_sale_proceeds + loan_draw - loan_paydown - interest_payment - scheduled_principal_payment'
+            ' + capital_calls + drip - redemptions - distributions - preferred_equity_draw + preferred_equity_repayment'
+        )
 
         # Determine the starting index for analysis_start_date
-        if self.analysis_start_date in portfolio_cash_flows['date'].values:
-            start_index = portfolio_cash_flows.index[portfolio_cash_flows['date'] == self.analysis_start_date][0]
-        else:
+        # Dates are sorted by the groupby, so a binary search finds the start row
+        period_dates = portfolio_cash_flows['date'].to_numpy()
+        start_index = int(np.searchsorted(period_dates, self.analysis_start_date))
+        if start_index >= len(period_dates) or period_dates[start_index] != self.analysis_start_date:
             start_index = 0
 
         # Set beginning and ending cash for the first period based on set_beginning_cash
         initial_cash = self.beginning_cash if self.beginning_cash is not None else 0.0
-        portfolio_cash_flows.at[start_index, 'beginning_cash'] = initial_cash
-        portfolio_cash_flows.at[
-            start_index, 'ending_cash'] = initial_cash  # Ensure first month's ending cash equals beginning cash
-
-        # Process each period, deducting management fee as needed
-        for i in range(start_index+1, len(portfolio_cash_flows)):
-            # For subsequent periods, carry over ending cash from previous period
-            if i > start_index:
-                portfolio_cash_flows.at[i, 'beginning_cash'] = portfolio_cash_flows.at[i - 1, 'ending_cash']
-
-            # Calculate provisional ending cash for this period before fee deduction
-            provisional_ending_cash = portfolio_cash_flows.at[i, 'beginning_cash'] + portfolio_cash_flows.at[
-                i, 'Net Cash Flow']
-
-            # Temporarily assign provisional ending cash
-            portfolio_cash_flows.at[i, 'ending_cash'] = provisional_ending_cash
-
-            # Calculate net asset value before fee deduction for this period
-            nav_before_fee = (
-                    portfolio_cash_flows.at[i, 'market_value'] -
-                    portfolio_cash_flows.at[i, 'ending_balance'] +
-                    provisional_ending_cash
-            )
 
-            # If it's the start of a quarter, calculate and deduct management fee
-            current_date = pd.to_datetime(portfolio_cash_flows.at[i, 'date'])
-            if current_date.month % 3 == 1:  # Assuming quarter start months (Jan, Apr, Jul, Oct)
-                management_fee = nav_before_fee * self.fee / 4
-            else:
-                management_fee = 0
-
-            # Deduct the fee from the provisional ending cash
-            adjusted_ending_cash = provisional_ending_cash - management_fee
-
-            # Update the DataFrame with the fee and adjusted cash
-            portfolio_cash_flows.at[i, 'management_fee'] = management_fee
-            portfolio_cash_flows.at[i, 'ending_cash'] = adjusted_ending_cash
-
-            # Recalculate net asset value after fee deduction for record-keeping
-            portfolio_cash_flows.at[i, 'net_asset_value'] = (
-                    portfolio_cash_flows.at[i, 'market_value'] -
-                    portfolio_cash_flows.at[i, 'ending_balance'] +
-                    adjusted_ending_cash
+        net_cash_flow = portfolio_cash_flows['Net Cash Flow'].to_numpy(dtype=float)
+        # The date column holds date objects, so read the months directly rather than re-parsing the column
+        months = np.fromiter((d.month for d in portfolio_cash_flows['date']), dtype=np.int64, count=len(portfolio_cash_flows))
+
+        market_value = portfolio_cash_flows['market_value'].to_numpy(dtype=float)
+        ending_balance = portfolio_cash_flows['ending_balance'].to_numpy(dtype=float)
+        beginning_cash = np.zeros(len(portfolio_cash_flows))
+        ending_cash = np.zeros(len(portfolio_cash_flows))
+        management_fee = np.full(len(portfolio_cash_flows), np.nan)
+        net_asset_value = np.full(len(portfolio_cash_flows), np.nan)
+        beginning_cash[start_index] = initial_cash
+        ending_cash[start_index] = initial_cash  # Ensure first month's ending cash equals beginning cash
+
+        # Roll cash forward period by period over the arrays; each quarterly fee depends on the cash carried in
+        for i in range(start_index + 1, len(portfolio_cash_flows)):
+            beginning_cash[i] = ending_cash[i - 1]
+            provisional_ending_cash = beginning_cash[i] + net_cash_flow[i]
+            nav_before_fee = market_value[i] - ending_balance[i] + provisional_ending_cash
+
+            # Management fee is charged at the start of each quarter (Jan, Apr, Jul, Oct)
+            management_fee[i] = nav_before_fee * self.fee / 4 if months[i] % 3 == 1 else 0
+            ending_cash[i] = provisional_ending_cash - management_fee[i]
+            net_asset_value[i] = market_value[i] - ending_balance[i] + ending_cash[i]
+
+        # Check for negative cash and log a warning
+        for i in np.flatnonzero(ending_cash[start_index + 1:] < 0) + start_index + 1:
+            logging.warning(
+                f"Warning: Cash is negative in period {i + 1}: ${ending_cash[i]:,.0f}. Consider a revolver draw or capital call."
             )
 
-            # Check for negative cash and log a warning
-            if adjusted_ending_cash < 0:
-                logging.warning(
-                    f"Warning: Cash is negative in period {i + 1}: ${adjusted_ending_cash:,.0f}. Consider a revolver draw or capital call."
-                )
+        portfolio_cash_flows['beginning_cash'] = beginning_cash
+        portfolio_cash_flows['ending_cash'] = ending_cash
+        portfolio_cash_flows['management_fee'] = management_fee
+        portfolio_cash_flows['net_asset_value'] = net_asset_value
 
-        # After loop operations for remaining calculations:
+        # After the cash roll-forward, remaining calculations:
 
         # Add unfunded commitments
         portfolio_cash_flows = portfolio_cash_flows.merge(
             self.get_unfunded_commitments_df(), how='left', on='date'
         )
-        portfolio_cash_flows.drop(['Property Name', 'Property Type', 'ownership_share'], axis=1, inplace=True)
-        portfolio_cash_flows = portfolio_cash_flows.loc[
-            (portfolio_cash_flows.date >= self.analysis_start_date) &
-            (portfolio_cash_flows.date <= self.analysis_end_date)
-            ]
+        portfolio_cash_flows.drop(['ownership_share'], axis=1, inplace=True)
 
         portfolio_cash_flows['leverage_ratio'] = (
                 portfolio_cash_flows.ending_balance /
@@ -783,130 +812,109 @@ class Portfolio:
         portfolio_cash_flows = self.calculate_income_and_gains(portfolio_cash_flows)
         return portfolio_cash_flows
 
+    @property
+    def all_loans(self):
+        """(loan, property) pairs for every property loan followed by (loan, None) for each unsecured loan."""
+        loans = [(loan, property) for property in self.properties.values() if getattr(property, 'loans', None)
+                 for loan in property.loans.values()]
+        loans.extend((loan, None) for loan in self.loans.values())
+        return loans
+
     def concat_property_loans(self):
-        loan_schedules = []
-        for property in self.properties.values():
-            if hasattr(property,
-                       'loans') and property.loans:  # Check if property has loans attribute and it's not empty
-                for loan in property.loans.values():
-                    loan_schedule = loan.generate_loan_schedule_df()
-                    loan_schedule['loan_id'] = loan.id
-                    loan_schedules.append(loan_schedule)
-
-        if not loan_schedules:
+        loans = [loan for loan, property in self.all_loans if property is not None]
+
+        if not loans:
             # Return empty DataFrame with expected columns
             return pd.DataFrame(columns=['date', 'beginning_balance', 'loan_draw',
                                          'loan_paydown', 'interest_payment',
                                          'scheduled_principal_payment', 'ending_balance'])
 
-        df = pd.concat(loan_schedules)
+        # Stack the schedules in one pass, then tag the rows with their loan ids in a single column write
+        loan_schedules = [loan.generate_loan_schedule_df() for loan in loans]
+        df = self._stack_frames(loan_schedules)
+        df['loan_id'] = np.repeat(np.array([loan.id for loan in loans], dtype=object), [len(schedule) for schedule in loan_schedules])
         return df
 
     def value_property_loans(self, as_of_date, discount_rate_spread):
-        loan_schedules = []
+        # Collect one plain tuple per loan and build the frame once at the end
+        rows = []
+        columns = ['Loan Id', 'As of Date', 'Current Balance', 'Market Rate', 'Loan Value']
         as_of_date = ensure_end_of_month(as_of_date)
-        for property in self.properties.values():
-            if property.loans:  # Check if property has loans attribute and it's not empty
-                for loan in property.loans.values():
-                    loan_schedule = loan.generate_loan_schedule_df()
-                    max_date = loan_schedule['date'].max()
-                    if max_date <= as_of_date:
-                        logging.warning(f"{loan.id}: Loan cash flows end before as of date.")
-                        continue
-                    current_balance = loan_schedule.loc[loan_schedule.date == as_of_date, 'ending_balance'].iloc[0]
-                    rate = loan.market_rate + discount_rate_spread
-                    loan_value = loan.calculate_loan_market_value(as_of_date, rate)
-                    loan_df = pd.DataFrame([[loan.id, as_of_date, current_balance, rate, loan_value]], columns=['Loan Id','As of Date','Current Balance','Market Rate','Loan Value'])
-                    loan_schedules.append(loan_df)
-        df = pd.concat(loan_schedules)
-        return df
+        for loan, property in self.all_loans:
+            if property is None:  # Unsecured loans are not valued here
+                continue
+            current_balance = self._balance_as_of(loan, loan.generate_loan_schedule_df(), as_of_date)
+            if current_balance is None:
+                continue
+            rate = loan.market_rate + discount_rate_spread
+            loan_value = loan.calculate_loan_market_value(as_of_date, rate)
+            rows.append((loan.id, as_of_date, current_balance, rate, loan_value))
+        return pd.DataFrame(rows, columns=columns)
+
+    def get_treasury_rate_arrays(self):
+        # Sorted (dates, rates) arrays for the valuers, built once per valuation call and shared by every loan in it
+        return build_treasury_rate_arrays(self.treasury_rates)
 
     def value_property_loans_with_valuer(self, as_of_date):
-        loan_schedules = []
+        rows = []
+        columns = ['Loan Id', 'As of Date', 'Current Balance', 'Note Rate', 'Market Rate', 'Spead', 'Loan Value']
         as_of_date = ensure_end_of_month(as_of_date)
-        for property in self.properties.values():
-            if property.loans:  # Check if property has loans attribute and it's not empty
-                for loan in property.loans.values():
-                    loan_schedule = loan.generate_loan_schedule_df()
-                    max_date = loan_schedule['date'].max()
-                    if max_date <= as_of_date:
-                        logging.warning(f"{loan.id}: Loan cash flows end before as of date.")
-                        continue
-                    rate = loan.rate
-                    market_value, market_rate = loan.value_loan(as_of_date, treasury_rates=self.treasury_rates)
-                    current_balance = loan_schedule.loc[loan_schedule.date == as_of_date, 'ending_balance'].iloc[0]
-                    spread = loan.spread
-                    loan_df = pd.DataFrame([[loan.id, as_of_date, current_balance, rate, market_rate, spread, market_value]], columns=['Loan Id','As of Date','Current Balance','Note Rate', 'Market Rate', 'Spead', 'Loan Value'])
-                    loan_schedules.append(loan_df)
-        for loan in self.loans.values():
+        treasury_rates = self.get_treasury_rate_arrays()
+        for loan, property in self.all_loans:
+            # Build the schedule once and share it between the balance lookup and the valuer
             loan_schedule = loan.generate_loan_schedule_df()
-            max_date = loan_schedule['date'].max()
-            if max_date <= as_of_date:
-                logging.warning(f"{loan.id}: Loan cash flows end before as of date.")
+            current_balance = self._balance_as_of(loan, loan_schedule, as_of_date)
+            if current_balance is None:
                 continue
             rate = loan.rate
-            market_value, market_rate = loan.value_loan(as_of_date, treasury_rates=self.treasury_rates)
-            current_balance = loan_schedule.loc[loan_schedule.date == as_of_date, 'ending_balance'].iloc[0]
+            market_value, market_rate = loan.value_loan(as_of_date, treasury_rates=treasury_rates, loan_schedule=loan_schedule)
             spread = loan.spread
-            loan_df = pd.DataFrame(
-                [[loan.id, as_of_date, current_balance, rate, market_rate, spread, market_value]],
-                columns=['Loan Id', 'As of Date', 'Current Balance', 'Note Rate', 'Market Rate', 'Spead',
-                         'Loan Value'])
-            loan_schedules.append(loan_df)
-        df = pd.concat(loan_schedules)
-        return df
+            rows.append((loan.id, as_of_date, current_balance, rate, market_rate, spread, market_value))
+        return pd.DataFrame(rows, columns=columns)
 
     def value_property_loans_at_share_with_valuer(self, as_of_date, chatham_style=True):
-        loan_schedules = []
+        rows = []
         columns = ['Loan Id', 'As of Date', 'Note Rate', 'Market Rate', 'Spread',
                    'Ownership Share', 'Current Balance', 'Loan Value']
         as_of_date = ensure_end_of_month(as_of_date)
-        for property in self.properties.values():
-            if property.loans:  # Check if property has loans attribute and it's not empty
-                for loan in property.loans.values():
-                    loan_schedule = loan.generate_loan_schedule_df()
-                    max_date = loan_schedule['date'].max()
-                    if max_date <= as_of_date:
-                        logging.warning(f"{loan.id}: Loan cash flows end before as of date.")
-                        continue
-                    rate = loan.rate
-                    market_value, market_rate = loan.value_loan(as_of_date, treasury_rates=self.treasury_rates, chatham_style=chatham_style)
-                    current_balance = loan_schedule.loc[loan_schedule.date == as_of_date, 'ending_balance'].iloc[0]
-                    spread = loan.spread or None
-                    ownership_share = self.properties.get(loan.property_id).get_ownership_share(as_of_date)
-                    loan_df = pd.DataFrame([[loan.id, as_of_date, rate, market_rate, spread, ownership_share, current_balance*ownership_share, market_value*ownership_share]], columns=columns)
-                    loan_schedules.append(loan_df)
-        for loan in self.loans.values():
+        treasury_rates = self.get_treasury_rate_arrays()
+        # Look up each property's share once, however many of its loans are valued
+        ownership_by_property = {}
+        for loan, property in self.all_loans:
             loan_schedule = loan.generate_loan_schedule_df()
-            max_date = loan_schedule['date'].max()
-            if max_date <= as_of_date:
-                logging.warning(f"{loan.id}: Loan cash flows end before as of date.")
+            current_balance = self._balance_as_of(loan, loan_schedule, as_of_date)
+            if current_balance is None:
                 continue
             rate = loan.rate
-            market_value, market_rate = loan.value_loan(as_of_date, treasury_rates=self.treasury_rates, chatham_style=chatham_style)
-            current_balance = loan_schedule.loc[loan_schedule.date == as_of_date, 'ending_balance'].iloc[0]
-            spread = loan.spread
-            loan_df = pd.DataFrame(
-                [[loan.id, as_of_date, rate, market_rate, spread, 1, current_balance, market_value]],
-                columns=columns)
-            loan_schedules.append(loan_df)
-        df = pd.concat(loan_schedules)
-        return df
+            market_value, market_rate = loan.value_loan(as_of_date, treasury_rates=treasury_rates, chatham_style=chatham_style,
+                                                        loan_schedule=loan_schedule)
+            if property is not None:
+                spread = loan.spread or None
+                if loan.property_id not in ownership_by_property:
+                    ownership_by_property[loan.property_id] = self.properties.get(loan.property_id).get_ownership_share(as_of_date)
+                ownership_share = ownership_by_property[loan.property_id]
+                rows.append((loan.id, as_of_date, rate, market_rate, spread, ownership_share,
+                             current_balance*ownership_share, market_value*ownership_share))
+            else:
+                spread = loan.spread
+                rows.append((loan.id, as_of_date, rate, market_rate, spread, 1, current_balance, market_value))
+        return pd.DataFrame(rows, columns=columns)
 
     def calculate_income_and_gains(self, df):
         df['market_value_change'] = df['market_value'].diff()
-        df['gain_loss'] = df['market_value_change'] - df['capex'] - df['partner_buyout_cost'] + df['disposition_price'] - df['acquisition_cost'] + df['preferred_equity_repayment'] - df['preferred_equity_draw'] + df['partial_sale_proceeds'] + df['foreclosure_market_value']
-        df['beginning_nav'] = df['net_asset_value'].shift(3)
-        cols_to_sum = ['capital_calls', 'drip']
-        df['capital_activity'] = df.apply(
-            lambda row: (
-                    df.loc[row.name - 2:row.name, cols_to_sum].sum().sum() -
-                    df.loc[row.name - 2:row.name, 'redemptions'].sum()
-            ), axis=1
+        # Evaluate the gain/loss expression in a single pass (uses numexpr when it is installed)
+        df.eval(
+            'gain_loss = market_value_change - capex - partner_buyout_cost + disposition_price - acquisition_cost'
+            ' + preferred_equity_repayment - preferred_equity_draw + partial_sale_proceeds + foreclosure_market_value',
+            inplace=True,
         )
+        df['beginning_nav'] = df['net_asset_value'].shift(3)
+        # Trailing three-period sums; min_periods=0 treats missing values as zero like Series.sum()
+        trailing = df[['capital_calls', 'drip', 'redemptions', 'gross_income', 'gain_loss']].rolling(3, min_periods=0).sum()
+        df['capital_activity'] = trailing['capital_calls'] + trailing['drip'] - trailing['redemptions']
         df['denominator'] = df['beginning_nav'] + df['capital_activity']
-        df['t3_income'] = df.apply(lambda row: (df.loc[row.name - 2:row.name, 'gross_income'].sum()), axis=1)
-        df['t3_gain_loss'] = df.apply(lambda row: (df.loc[row.name - 2:row.name, 'gain_loss'].sum()), axis=1)
+        df['t3_income'] = trailing['gross_income']
+        df['t3_gain_loss'] = trailing['gain_loss']
         df['income_return'] = df['t3_income'] / df['denominator']
         df['appreciation_return'] = df['t3_gain_loss'] / df['denominator']
         df['total_return'] = df['income_return'] + df['appreciation_return']
@@ -924,12 +932,25 @@ class Portfolio:
 
     from datetime import date
 
-    def fetch_treasury_rates(self, series_id: str = 'DGS10'):
-        # Fetch rates from FRED API
-        import os
-
+    def fetch_treasury_rates(self, series_id: str = 'DGS10', use_cache: bool = False, force_refresh: bool = False):
         fred_base_url = "https://api.stlouisfed.org/fred/series/observations"
+        chatham_url = "https://www.chathamfinancial.com/getrates/278177"
         start_date = date(2013, 1, 1)  # Fixed start date
+
+        # Opt-in: reuse a recent JSON copy instead of repeating the HTTP round trips. The file name hashes
+        # every source that feeds the rates, so changing the series or an endpoint never reads a stale file;
+        # force_refresh refetches and rewrites it.
+        cache_key = hashlib.sha256(
+            json.dumps([series_id, start_date.isoformat(), fred_base_url, chatham_url]).encode()
+        ).hexdigest()[:16]
+        cache_path = os.path.join(TREASURY_CACHE_DIR, f"treasury_rates_{cache_key}.json")
+        if use_cache and not force_refresh and os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < TREASURY_CACHE_TTL_SECONDS:
+            with open(cache_path) as cache_file:
+                cached_rates = json.load(cache_file)
+            self.treasury_rates.update({date.fromisoformat(day): rate for day, rate in cached_rates.items()})
+            return
+
+        # Fetch rates from FRED API
         end_date = date.today()  # Use the current date as the end date
 
         # SECURITY: API key should be set as environment variable FRED_API_KEY
@@ -945,43 +966,57 @@ class Portfolio:
             "observation_end": end_date.strftime("%Y-%m-%d"),
         }
 
-        fred_response = requests.get(fred_base_url, params=fred_params)
-
-        if fred_response.status_code == 200:
-            fred_data = fred_response.json()
-            observations = fred_data.get("observations", [])
-            for obs in observations:
-                obs_date = date.fromisoformat(obs["date"])
-                try:
-                    self.treasury_rates[obs_date] = float(obs["value"]) / 100  # Convert percentage to decimal
-                except ValueError:
-                    continue  # Skip invalid data
-        else:
-            raise ValueError(f"FRED API request failed: {fred_response.status_code}, {fred_response.text}")
-
         # Fetch rates from Chatham Financial API
-        chatham_url = "https://www.chathamfinancial.com/getrates/278177"
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36",
             "Accept": "application/json",
             "Accept-Language": "en-US,en;q=0.9",
             "Connection": "keep-alive"
         }
-        chatham_response = requests.get(chatham_url, headers=headers)
+
+        # The two requests are independent, so issue them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            fred_future = executor.submit(self._http.get, fred_base_url, params=fred_params,
+                                          timeout=TREASURY_REQUEST_TIMEOUT_SECONDS)
+            chatham_future = executor.submit(self._http.get, chatham_url, headers=headers,
+                                             timeout=TREASURY_REQUEST_TIMEOUT_SECONDS)
+            fred_response = fred_future.result()
+            chatham_response = chatham_future.result()
+
+        if fred_response.status_code == 200:
+            fred_data = fred_response.json()
+            observations = pd.DataFrame(fred_data.get("observations", []), columns=['date', 'value'])
+            observations['date'] = pd.to_datetime(observations['date']).dt.date
+            # Convert percentage to decimal, skipping invalid data
+            observations['value'] = pd.to_numeric(observations['value'], errors='coerce') / 100
+            observations = observations.dropna(subset=['value'])
+            fetched_rates = dict(zip(observations['date'], observations['value']))
+        else:
+            raise ValueError(f"FRED API request failed: {fred_response.status_code}, {fred_response.text}")
 
         if chatham_response.status_code == 200:
             chatham_data = chatham_response.json()
-            for rate_entry in chatham_data.get("Rates", []):
-                try:
-                    raw_date = date.fromisoformat(rate_entry["Date"][:10])  # Extract only the date part
-                    eom_date = ensure_end_of_month(raw_date)  # Convert to end-of-month using ensure_date
-                    rate_value = rate_entry["Rate"]
-                    self.treasury_rates[eom_date] = rate_value  # Add directly in decimal format
-                except (ValueError, KeyError):
-                    continue  # Skip invalid data
+            rates = pd.DataFrame(chatham_data.get("Rates", []), columns=['Date', 'Rate'])
+            # Extract only the date part and convert to end-of-month, skipping invalid data
+            raw_dates = pd.to_datetime(rates['Date'].astype(str).str.slice(0, 10), format='%Y-%m-%d', errors='coerce')
+            rates['date'] = (raw_dates + pd.offsets.MonthEnd(0)).dt.date
+            rates = rates.loc[raw_dates.notna() & rates['Rate'].notna()]
+            fetched_rates.update(zip(rates['date'], rates['Rate']))  # Add directly in decimal format
         else:
             raise ValueError(f"Chatham API request failed: {chatham_response.status_code}, {chatham_response.text}")
 
+        self.treasury_rates.update(fetched_rates)
+        if use_cache:
+            try:
+                os.makedirs(TREASURY_CACHE_DIR, exist_ok=True)
+                # Write to a temporary file and swap it in so a concurrent reader never sees a partial file
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as cache_file:
+                    json.dump({day.isoformat(): float(rate) for day, rate in fetched_rates.items()}, cache_file)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logging.warning(f"Could not write treasury rate cache {cache_path}: {e}")
+
 
 
 
@@ -1,10 +1,11 @@
+from bisect import bisect_right
+import numpy as np
 import pandas as pd
 from datetime import date, datetime
 from typing import Optional, List, Tuple
 from calendar import monthrange
-from decimal import Decimal
 from portfolio_manager.Loan import Loan
-from portfolio_manager.date_utils import ensure_end_of_month
+from portfolio_manager.date_utils import ensure_end_of_month, ensure_end_of_month_series
 
 
 class PreferredEquity:
@@ -21,7 +22,8 @@ class PreferredEquity:
         """
         self.id = id
         self.underlying_loan = underlying_loan
-        self.pe_ownership_changes: List[Tuple[date, Decimal]] = []
+        self.pe_ownership_changes: List[Tuple[date, float]] = []
+        self._change_dates: List[date] = []  # Sorted change dates, parallel to pe_ownership_changes
 
         # Validate initial ownership
         self._validate_ownership(initial_pe_ownership)
@@ -40,24 +42,34 @@ class PreferredEquity:
         """
         change_date = ensure_end_of_month(change_date)  # Align to month-end
         self._validate_ownership(new_ownership)
-        self.pe_ownership_changes.append((change_date, Decimal(new_ownership)))
-        # Keep changes sorted by date
+        # Insert in date order (after any existing change on the same date) to keep both lists sorted
+        position = bisect_right(self._change_dates, change_date)
+        self._change_dates.insert(position, change_date)
+        self.pe_ownership_changes.insert(position, (change_date, float(new_ownership)))
+
+    def bulk_add_pe_ownership_changes(self, changes: List[Tuple[date, float]]):
+        """
+        Record several ownership change events at once, sorting the history a single time.
+        """
+        new_changes = []
+        for change_date, new_ownership in changes:
+            self._validate_ownership(new_ownership)
+            new_changes.append((ensure_end_of_month(change_date), float(new_ownership)))
+        # Stable sort keeps same-date changes in the order they were recorded
+        self.pe_ownership_changes.extend(new_changes)
         self.pe_ownership_changes.sort(key=lambda x: x[0])
+        self._change_dates = [change_date for change_date, _ in self.pe_ownership_changes]
 
-    def get_ownership_share(self, query_date: date) -> Decimal:
+    def get_ownership_share(self, query_date: date) -> float:
         """
         Get the preferred equity ownership share for a specific date.
         If no change date is prior, it defaults to 0.0.
         """
         query_date = ensure_end_of_month(query_date)
-        if not self.pe_ownership_changes:
-            return Decimal(0.0)
 
         # Find the most recent change before or on query_date
-        for change_date, ownership_share in reversed(self.pe_ownership_changes):
-            if query_date >= change_date:
-                return ownership_share
-        return Decimal(0.0)
+        i = bisect_right(self._change_dates, query_date) - 1
+        return self.pe_ownership_changes[i][1] if i >= 0 else 0.0
 
     def generate_pe_ownership_series(self) -> dict:
         """
@@ -70,21 +82,9 @@ class PreferredEquity:
         if df_loan.empty:
             return {}
 
-        df_loan['date'] = df_loan['date'].apply(ensure_end_of_month)
-        schedule_dates = sorted(df_loan['date'].unique())
-
-        # Build the ownership series
-        ownership_series = {}
-        current_ownership = Decimal(0.0)
-        change_idx = 0
-
-        for d in schedule_dates:
-            while change_idx < len(self.pe_ownership_changes) and d >= self.pe_ownership_changes[change_idx][0]:
-                _, current_ownership = self.pe_ownership_changes[change_idx]
-                change_idx += 1
-            ownership_series[d] = current_ownership
-
-        return ownership_series
+        df_loan['date'] = ensure_end_of_month_series(df_loan['date'])
+        schedule_dates = np.unique(df_loan['date'].to_numpy())
+        return dict(zip(schedule_dates.tolist(), self._ownership_shares(schedule_dates).tolist()))
 
     # ---------------------------------------------------------------------
     #               GENERATE PREFERRED EQUITY CASH FLOWS
@@ -98,7 +98,7 @@ class PreferredEquity:
         if df_loan.empty:
             return pd.DataFrame()
 
-        df_loan['date'] = df_loan['date'].apply(ensure_end_of_month)
+        df_loan['date'] = ensure_end_of_month_series(df_loan['date'])
 
         # Rename columns for preferred equity perspective
         df_loan['noi'] = df_loan['interest_payment']
@@ -116,33 +116,38 @@ class PreferredEquity:
         df_loan.sort_values('date', inplace=True)
         return df_loan
 
-    def generate_preferred_equity_schedule_share_df(self) -> pd.DataFrame:
+    def generate_preferred_equity_schedule_share_df(self, start_date: Optional[date] = None,
+                                                    end_date: Optional[date] = None) -> pd.DataFrame:
         """
         Generates a DataFrame that applies the Preferred Equity ownership
-        shares to the 'full ownership' amounts.
+        shares to the 'full ownership' amounts, optionally limited to the
+        months between start_date and end_date (inclusive).
         """
         df_full = self.generate_preferred_equity_schedule_df()
         if df_full.empty:
             return pd.DataFrame()
 
-        ownership_dict = self.generate_pe_ownership_series()
-        df_ownership = pd.DataFrame(list(ownership_dict.items()), columns=['date', 'ownership_share'])
-        df_ownership['date'] = df_ownership['date'].apply(ensure_end_of_month)  # Align dates
-        df_ownership['ownership_share'] = df_ownership['ownership_share'].astype(float)
-        df_ownership.sort_values('date', inplace=True)
-
-        # Merge and scale amounts by ownership share
-        df_merged = pd.merge(df_full, df_ownership, on='date', how='left')
-        df_merged['ownership_share'] = df_merged['ownership_share'].fillna(0.0)
-        for col in ['noi', 'preferred_equity_draw', 'preferred_equity_repayment', 'market_value']:
-            df_merged[col] *= df_merged['ownership_share']
-
-        return df_merged[['date', 'Property Name', 'Property Type', 'ownership_share','noi', 'preferred_equity_draw',
-                           'preferred_equity_repayment', 'market_value']].copy()
+        df_full = df_full.reset_index(drop=True)
+        # Trim to the requested window before any ownership work
+        if start_date is not None or end_date is not None:
+            in_window = np.ones(len(df_full), dtype=bool)
+            if start_date is not None:
+                in_window &= (df_full['date'] >= start_date).to_numpy()
+            if end_date is not None:
+                in_window &= (df_full['date'] <= end_date).to_numpy()
+            df_full = df_full.loc[in_window].copy()
+
+        # Ownership is looked up directly from the schedule dates, so the loan schedule is not rebuilt
+        ownership_share = self._ownership_shares(df_full['date'].to_numpy())
+        df_full.insert(3, 'ownership_share', ownership_share)
+
+        # Scale all amount columns by ownership share in one block multiplication
+        amount_columns = ['noi', 'preferred_equity_draw', 'preferred_equity_repayment', 'market_value']
+        df_full[amount_columns] = df_full[amount_columns].to_numpy() * ownership_share[:, None]
+        return df_full
 
     def get_preferred_equity_schedule_share_df_by_date(self, start_date, end_date):
-        df = self.generate_preferred_equity_schedule_share_df()
-        return df.loc[ (df.date >= start_date) & (df.date <= end_date)]
+        return self.generate_preferred_equity_schedule_share_df(start_date, end_date)
     # ---------------------------------------------------------------------
     #                       HELPER METHODS
     # ---------------------------------------------------------------------
@@ -157,6 +162,17 @@ class PreferredEquity:
         min_ts = df_schedule['date'].min()
         return ensure_end_of_month(min_ts)
 
+    def _ownership_shares(self, dates: np.ndarray) -> np.ndarray:
+        """
+        Ownership share in effect on each of the given month-end dates (0.0 before the first change).
+        """
+        # Locate the latest change on or before each date in one pass over the sorted change dates;
+        # dates before the first change get index -1, which picks the trailing zero ownership
+        change_dates = np.array(self._change_dates, dtype='datetime64[D]')
+        shares = np.array([share for _, share in self.pe_ownership_changes] + [0.0], dtype=np.float64)
+        idx = np.searchsorted(change_dates, np.asarray(dates).astype('datetime64[D]'), side='right') - 1
+        return shares[idx]
+
     def _validate_ownership(self, ownership: float):
         """
         Ensure the ownership value is between 0.0 and 1.0.
@@ -3,12 +3,15 @@ from dateutil.relativedelta import relativedelta
 from calendar import monthrange
 from typing import Optional
 from portfolio_manager.Loan import Loan
+from portfolio_manager.LoanValuation import build_treasury_rate_arrays
 from portfolio_manager.CarriedInterest import CarriedInterest, TierParams
-from portfolio_manager.date_utils import ensure_end_of_month
+from portfolio_manager.date_utils import ensure_end_of_month, ensure_end_of_month_series, month_end_list, sum_frames_by_date
 import pandas as pd
+import numpy as np
 from itertools import accumulate
+from collections import defaultdict
+from bisect import bisect_right
 import logging
-import numpy_financial as npf
 
 class Property:
 
@@ -78,7 +81,11 @@ class Property:
         self.tiers = []
         self.effective_shares = None
         self.month_list = self.get_month_list(self.analysis_date, self.analysis_length)
+        self._month_index = {month: i for i, month in enumerate(self.month_list)}
         self.ownership_changes = []
+        self._ownership_dates = []  # Sorted change dates, parallel to ownership_changes
+        self._ownership_events_key = None
+        self._ownership_events_dirty = True
         self.construction_end = ensure_end_of_month(construction_end)
         self.equity_commitment = equity_commitment
         self.partial_sale_date = partial_sale_date
@@ -103,7 +110,8 @@ class Property:
 
         self.process_ownership_events()
         self.unfunded_equity_commitments = []
-        self.market_values = self.grow_market_value()
+        self._market_values_dirty = True
+        self.market_values = self.get_market_values()
 
 
     def add_promote_tier(self, tier: TierParams):
@@ -137,36 +145,61 @@ class Property:
             date_ (date or str): The date of the cash flow.
             cash_flow (float): The cash flow amount.
         """
-        # Ensure self.promote_cash_flows is initialized as a DataFrame
-        if not isinstance(self.promote_cash_flows, pd.DataFrame):
-            self.promote_cash_flows = pd.DataFrame(columns=['date', 'cash_flow'])
-
-        # Normalize the date using ensure_date method
-        # This should return a Python date object
-        date_ = ensure_end_of_month(date_)
-
-        # Convert any existing 'date' column entries to date objects if they aren't already
-        if not self.promote_cash_flows.empty:
-            self.promote_cash_flows['date'] = pd.to_datetime(self.promote_cash_flows['date']).dt.date
-
-        # Check if the date already exists in the DataFrame
-        if date_ in self.promote_cash_flows['date'].values:
-            # If yes, update the existing cash_flow value by adding the new amount
-            mask = self.promote_cash_flows['date'] == date_
-            self.promote_cash_flows.loc[mask, 'cash_flow'] += cash_flow
+        # Accumulate per date; the DataFrame is rebuilt once, the next time promote_cash_flows is read
+        self._pending_promote_cash_flows[ensure_end_of_month(date_)] += cash_flow
+
+    @property
+    def promote_cash_flows(self):
+        self._finalize_promote_cash_flows()
+        return self._promote_cash_flows
+
+    @promote_cash_flows.setter
+    def promote_cash_flows(self, value):
+        self._pending_promote_cash_flows = defaultdict(float)
+        self._promote_cash_flows = value
+
+    def _finalize_promote_cash_flows(self):
+        """Fold the pending add_promote_cash_flow totals into the promote cash flow DataFrame in one pass."""
+        if not self._pending_promote_cash_flows:
+            return
+        pending = self._pending_promote_cash_flows
+        self._pending_promote_cash_flows = defaultdict(float)
+
+        df = self._promote_cash_flows
+        if isinstance(df, pd.DataFrame) and not df.empty:
+            df = df.copy()
+            df['date'] = pd.to_datetime(df['date']).dt.date
+            # Add to rows already on a buffered date, append rows for new dates
+            existing = df['date'].isin(pending.keys())
+            df.loc[existing, 'cash_flow'] = df.loc[existing, 'cash_flow'] + df.loc[existing, 'date'].map(pending)
+            known_dates = set(df['date'])
+            new_rows = [(date_, cash_flow) for date_, cash_flow in pending.items() if date_ not in known_dates]
+            if new_rows:
+                df = pd.concat([df, pd.DataFrame(new_rows, columns=['date', 'cash_flow'])], ignore_index=True)
         else:
-            # Otherwise, create a new row and append it
-            new_row = pd.DataFrame({'date': [date_], 'cash_flow': [cash_flow]})
-            self.promote_cash_flows = pd.concat([self.promote_cash_flows, new_row], ignore_index=True)
+            df = pd.DataFrame(list(pending.items()), columns=['date', 'cash_flow'])
+        self._promote_cash_flows = df.sort_values(by='date').reset_index(drop=True)
 
-        # Ensure 'date' column stays as date type and DataFrame is sorted by date
-        self.promote_cash_flows['date'] = pd.to_datetime(self.promote_cash_flows['date']).dt.date
-        self.promote_cash_flows = self.promote_cash_flows.sort_values(by='date').reset_index(drop=True)
+    def get_market_values(self):
+        """
+        Monthly market values, recomputed only after a setter has changed the valuation inputs.
 
+        Change NOI, CapEx, the market value or the valuation method through the update_* and
+        set_valuation_method setters; edits made straight on the attributes are not seen.
+        """
+        if self._market_values_dirty:
+            self.market_values = self.grow_market_value()
+            self._market_value_by_date = dict(zip(self.month_list, self.market_values))
+            self._market_values_dirty = False
+        return self.market_values
 
     def get_market_value_by_date(self, date_):
-        date_index = self.month_list.index(date_)
-        return self.market_values[date_index]
+        if self._market_values_dirty:
+            self.get_market_values()
+        try:
+            return self._market_value_by_date[date_]
+        except KeyError:
+            raise ValueError(f"{date_} is not in the analysis period") from None
 
     def get_foreclosure_market_value(self):
         if len(self.loans) > 0:
@@ -174,7 +207,6 @@ class Property:
                 if loan.foreclosure_date:
                     self.foreclosure_date = loan.foreclosure_date
                     date_before_foreclosure = ensure_end_of_month(loan.foreclosure_date + relativedelta(months=-1))
-                    self.market_values = self.grow_market_value()
                     return self.get_market_value_by_date(date_before_foreclosure)
         return 0
 
@@ -189,6 +221,14 @@ class Property:
 
     def process_ownership_events(self):
         """Process all ownership changes (buyouts, partial sales, etc.) in chronological order."""
+        # The events depend only on these attributes; skip the rebuild when none changed since the last run
+        key = (self.acquisition_date, self.ownership, self.disposition_date, self.partner_buyout_date,
+               self.partner_buyout_percent, self.partial_sale_date, self.partial_sale_percent)
+        if not self._ownership_events_dirty and key == self._ownership_events_key:
+            return
+        self._ownership_events_key = key
+        self._ownership_events_dirty = False
+
         events = []
 
         # Initial acquisition ownership
@@ -225,24 +265,24 @@ class Property:
 
         # Reassign the processed events to ownership changes
         self.ownership_changes = [(ensure_end_of_month(date), ownership) for date, ownership in events]
+        self._ownership_dates = [change_date for change_date, _ in self.ownership_changes]
     def add_ownership_change(self, change_date: date, new_ownership: float):
         """Add an ownership change event."""
         change_date = ensure_end_of_month(change_date)  # Ensure the date is a `datetime.date` object
-        self.ownership_changes.append((ensure_end_of_month(change_date), new_ownership))
-        self.ownership_changes.sort()  # Ensure events are sorted by date
+        # Insert in sorted position (same order a full sort would give) and keep the date list parallel
+        event = (change_date, new_ownership)
+        i = bisect_right(self.ownership_changes, event)
+        self.ownership_changes.insert(i, event)
+        self._ownership_dates.insert(i, change_date)
+        self._ownership_events_dirty = True  # The next process_ownership_events rebuilds from the event attributes
 
     def get_ownership_share(self, query_date: date) -> float:
         """Get the ownership share for a specific date."""
         self.process_ownership_events()  # Ensure events are processed before querying
 
-        if not self.ownership_changes:
-            return 0.0  # Default to zero if no changes exist
-
-        for change_date, ownership in reversed(self.ownership_changes):
-            if query_date >= change_date:
-                return ownership
-
-        return 0.0
+        # Latest change on or before query_date; zero before the first change (or if there are none)
+        i = bisect_right(self._ownership_dates, query_date) - 1
+        return self.ownership_changes[i][1] if i >= 0 else 0.0
 
     def add_partial_sale(self, partial_date, proceeds, sale_percent):
         """Record a partial sale event."""
@@ -262,27 +302,22 @@ class Property:
         """Generate a time series of ownership percentages without mutating self.ownership_changes."""
         self.process_ownership_events()  # Ensure events are processed before generating the series
 
-        ownership_series = {}
-        current_ownership = 0.0  # Default ownership before acquisition
-        changes = sorted(self.ownership_changes, key=lambda x: x[0])
-
-        for month in self.month_list:
-            # Skip months before acquisition
-            if self.acquisition_date and month < self.acquisition_date:
-                continue
-
-            # Apply ownership changes
-            while changes and changes[0][0] <= month:
-                current_ownership = changes.pop(0)[1]
+        # Skip months before acquisition
+        months = self.month_list
+        if self.acquisition_date:
+            months = [month for month in months if month >= self.acquisition_date]
 
-            ownership_series[month] = current_ownership
+        # Map every month to the latest change on or before it in one search; months before the
+        # first change get index -1, which picks the trailing zero ownership
+        change_dates = np.array(self._ownership_dates, dtype='datetime64[D]')
+        shares = np.array([ownership for _, ownership in self.ownership_changes] + [0.0], dtype=np.float64)
+        idx = np.searchsorted(change_dates, np.array(months, dtype='datetime64[D]'), side='right') - 1
 
-        return ownership_series
+        return dict(zip(months, shares[idx].tolist()))
 
     def get_month_list(self, start_date: date, num_months: int) -> list:
         """Generate a list of the last day of each month, ensuring all are `datetime.date` objects."""
-        return [ensure_end_of_month(ensure_end_of_month(start_date + relativedelta(months=i))) for i in
-                range(num_months)]
+        return month_end_list(start_date, num_months)
 
     def get_equity_commitment(self):
         return self.equity_commitment or 0
@@ -320,39 +355,42 @@ class Property:
         if pd.isna(self.construction_end) or self.construction_end is None:
             return [0] * len(self.month_list)
 
-        # Initialize variables
-        unfunded_equity = self.equity_commitment
-        unfunded_equity_commitments = []
-
-        # Iterate through the month list
-        for draw_date in self.month_list:
-            # Retrieve NOI and CapEx, defaulting to zero if missing
-            noi = self.noi.get(draw_date, 0)
-            capex = self.capex.get(draw_date, 0)
-            period_ncf = noi - capex
-
-            # Step 1: Calculate the period deficit
-            deficit = self.calculate_period_deficit(period_ncf)
-
-            # Step 2: Cover deficit with equity
-            equity_contribution, deficit, unfunded_equity = self.cover_deficit_with_equity(deficit, unfunded_equity)
-            self.add_promote_cash_flow(draw_date, -equity_contribution)
-            # Step 3: Cover remaining deficit with loans
-            if deficit > 0:
-
-                deficit = self.cover_deficit_with_loans(deficit, draw_date, self.loans)
-
-            # Step 4: Log error if deficit remains (optional)
+        # Monthly deficits (negative net cash flow) for the whole analysis period
+        noi = self._monthly_values('noi')
+        capex = self._monthly_values('capex')
+        deficits = np.maximum(capex - noi, 0)
+
+        # Equity covers deficits in order until the commitment is used up; a missing commitment funds nothing
+        commitment = 0.0 if pd.isna(self.equity_commitment) else max(self.equity_commitment, 0)
+        cumulative_deficits = np.cumsum(deficits)
+        equity_used = np.minimum(cumulative_deficits, commitment)
+        fully_covered = cumulative_deficits <= commitment
+        equity_contributions = np.where(fully_covered, deficits, np.diff(equity_used, prepend=0.0))
+        remaining_deficits = np.where(fully_covered, 0.0, deficits - equity_contributions)
+        unfunded_equity_commitments = (commitment - equity_used).tolist()
+
+        # Collect this run's promote flows by month-end and fold them into the pending totals once at the end
+        promote_flows = dict(zip(self.month_list, (-equity_contributions).tolist()))
+
+        # Loans carry draw state, so the months equity could not cover are funded one at a time
+        for i in np.flatnonzero(remaining_deficits > 0):
+            draw_date = self.month_list[i]
+            deficit = self.cover_deficit_with_loans(float(remaining_deficits[i]), draw_date, self.loans)
+
+            # Log error if deficit remains
             if deficit > 0:
                 logging.error(f"{self.name}: Remaining deficit on {draw_date}: {deficit:.2f}")
-                self.add_promote_cash_flow(draw_date, -deficit)
-            # Step 5: Track current unfunded equity balance
-            unfunded_equity_commitments.append(unfunded_equity)
+                promote_flows[draw_date] -= deficit
+
+        pending = self._pending_promote_cash_flows
+        for draw_date, cash_flow in promote_flows.items():
+            pending[draw_date] += cash_flow
 
         return unfunded_equity_commitments
 
     def set_valuation_method(self, valuation_method="growth"):
         self.valuation_method = valuation_method
+        self._market_values_dirty = True
         return
 
     def grow_market_value(self):
@@ -371,40 +409,81 @@ class Property:
             # Validate inputs
             self._validate_market_value_inputs()
 
-            # Initialize variables
-            market_values = []
-            current_value = self.market_value
+            n = len(self.month_list)
+            if n == 0:
+                return []
+            months = np.array(self.month_list, dtype='datetime64[D]')
             growth_rate = (1 + self.market_value_growth) ** (1 / 12)
             construction_finished = (self.construction_end is None) or (self.construction_end < self.analysis_date)
             total_months = 120  # For cap rate interpolation
 
-            # Calculate market values for each month
-            for idx, month in enumerate(self.month_list):
-                try:
-                    if month == self.acquisition_date:
-                        current_value = self.acquisition_cost
-                    else:
-                        current_value = self._calculate_monthly_value(
-                            idx=idx,
-                            month=month,
-                            current_value=current_value,
-                            growth_rate=growth_rate,
-                            construction_finished=construction_finished,
-                            total_months=total_months
-                        )
-                    market_values.append(current_value)
-
-                except Exception as e:
-                    logging.error(f"Error calculating market value for month {month}: {str(e)}")
-                    # Fallback to previous value or 0
-                    market_values.append(market_values[-1] if market_values else 0)
-
-            return market_values
+            # The value resets to the acquisition cost in the acquisition month
+            acquisition_idx = np.flatnonzero(months == np.datetime64(self.acquisition_date, 'D')) if self.acquisition_date else []
+            acquisition_idx = int(acquisition_idx[0]) if len(acquisition_idx) else None
+
+            if self.disposition_date is None:
+                # Without a disposition date no month can be valued; values carry forward from the last known value
+                logging.error(f"{self.name}: No disposition date; market values are carried forward unchanged")
+                values = np.full(n, float(self.market_value))
+                if acquisition_idx is not None:
+                    values[acquisition_idx:] = self.acquisition_cost
+                return values.tolist()
+
+            if self.valuation_method == "cap_rate" and construction_finished:
+                # Each month is its forward twelve-month NOI capitalized at a cap rate ramping to the exit rate
+                fractions = np.minimum(np.arange(n) / total_months, 1)
+                interpolated_cap_rates = self.cap_rate + fractions * (self.exit_cap_rate - self.cap_rate)
+                values = self._forward_noi_sums(months) / interpolated_cap_rates
+                values[0] = self.market_value
+                if acquisition_idx is not None:
+                    values[acquisition_idx] = self.acquisition_cost
+            else:
+                # Growth rate method: value[i] = value[i-1] * growth_rate + capex[i], restarting at acquisition
+                capex = np.zeros(n)
+                if not construction_finished and self.construction_end:
+                    capex = np.where(months <= np.datetime64(self.construction_end, 'D'), self._monthly_values('capex'), 0.0)
+                start_values = {0: self.market_value}
+                if acquisition_idx is not None:
+                    start_values[acquisition_idx] = self.acquisition_cost
+                bounds = sorted(start_values) + [n]
+                values = np.empty(n)
+                for start, stop in zip(bounds[:-1], bounds[1:]):
+                    values[start:stop] = self._compound(start_values[start], capex[start:stop], growth_rate)
+
+            # Months on or after disposition are worth nothing (the first month and acquisition month excepted)
+            disposed = months >= np.datetime64(self.disposition_date, 'D')
+            disposed[0] = False
+            if acquisition_idx is not None:
+                disposed[acquisition_idx] = False
+            values[disposed] = 0
+            return values.tolist()
 
         except Exception as e:
             logging.error(f"Error in grow_market_value: {str(e)}")
             raise
 
+    @staticmethod
+    def _compound(start_value, capex, growth_rate):
+        """Closed form of value[i] = value[i-1] * growth_rate + capex[i] with value[0] = start_value."""
+        growth = growth_rate ** np.arange(len(capex))
+        discounted_capex = np.concatenate(([0.0], np.cumsum(capex[1:] / growth[1:])))
+        return growth * (start_value + discounted_capex)
+
+    def _forward_noi_sums(self, months):
+        """Sum of NOI dated within the twelve months starting at each month-end in `months` (datetime64[D])."""
+        if not self.noi:
+            return np.zeros(len(months))
+        noi_dates = sorted(self.noi)
+        dates = np.array(noi_dates, dtype='datetime64[D]')
+        running = np.concatenate(([0.0], np.cumsum([self.noi[d] for d in noi_dates], dtype=np.float64)))
+        window_ends = (pd.DatetimeIndex(months) + pd.offsets.MonthEnd(12)).values.astype('datetime64[D]')
+        return running[np.searchsorted(dates, window_ends)] - running[np.searchsorted(dates, months)]
+
+    def _monthly_values(self, name):
+        """The `name` ('noi' or 'capex') dict as a float array aligned to month_list, zero where a month is missing."""
+        values = getattr(self, name)
+        return np.fromiter((values.get(month, 0) for month in self.month_list), dtype=np.float64, count=len(self.month_list))
+
     def _validate_market_value_inputs(self):
         """Validate required inputs for market value calculations."""
         if not isinstance(self.market_value, (int, float)) or self.market_value < 0:
@@ -419,38 +498,6 @@ class Property:
             if self.cap_rate <= 0 or self.exit_cap_rate <= 0:
                 raise ValueError("Cap rates must be positive")
 
-    def _calculate_monthly_value(self, idx, month, current_value, growth_rate, 
-                               construction_finished, total_months):
-        """Calculate market value for a single month."""
-        if idx == 0:
-            return current_value
-        
-        if month >= self.disposition_date:
-            return 0
-        
-        if self.valuation_method == "cap_rate" and construction_finished:
-            return self._calculate_cap_rate_value(idx, month, total_months)
-        
-        # Growth rate method with CAPEX
-        capex = self._get_monthly_capex(month, construction_finished)
-        return current_value * growth_rate + capex
-
-    def _calculate_cap_rate_value(self, idx, month, total_months):
-        """Calculate value using cap rate method."""
-        fraction = min(idx / total_months, 1)
-        interpolated_cap_rate = self.cap_rate + fraction * (self.exit_cap_rate - self.cap_rate)
-        
-        if interpolated_cap_rate <= 0:
-            raise ValueError(f"Invalid interpolated cap rate: {interpolated_cap_rate}")
-        
-        return self.capitalize_forward_noi(month, interpolated_cap_rate)
-
-    def _get_monthly_capex(self, month, construction_finished):
-        """Get CAPEX amount for the month if applicable."""
-        if construction_finished or not self.construction_end:
-            return 0
-        return self.capex.get(month, 0) if month <= self.construction_end else 0
-
     def get_disposition_date(self):
         return self.disposition_date
 
@@ -465,14 +512,17 @@ class Property:
 
     def update_market_value(self, market_value):
         self.market_value = market_value
+        self._market_values_dirty = True
         return
 
     def update_noi(self, noi: dict):
         self.noi = noi
+        self._market_values_dirty = True
 
 
     def update_capex(self, capex: dict):
         self.capex = capex
+        self._market_values_dirty = True
 
     def update_noi_by_date(self, date_, noi):
         date_ = ensure_end_of_month(date_)
@@ -480,9 +530,10 @@ class Property:
             raise ValueError("The provided date is invalid or could not be converted.")
         if not isinstance(noi, (int, float)):
             raise TypeError(f"Invalid NOI type: {type(noi)}. Expected int or float.")
-        if date_ not in self.month_list:
+        if date_ not in self._month_index:
             raise ValueError(f"Date {date_} is outside the analysis period.")
         self.noi[date_] = noi
+        self._market_values_dirty = True
 
     def update_capex_by_date(self, date_, capex):
         date_ = ensure_end_of_month(date_)
@@ -490,9 +541,10 @@ class Property:
             raise ValueError("The provided date is invalid or could not be converted.")
         if not isinstance(capex, (int, float)):
             raise TypeError(f"Invalid NOI type: {type(capex)}. Expected int or float.")
-        if date_ not in self.month_list:
+        if date_ not in self._month_index:
             raise ValueError(f"Date {date_} is outside the analysis period.")
         self.capex[date_] = capex
+        self._market_values_dirty = True
 
     def get_capex(self, date_,):
         date_ = ensure_end_of_month(date_)
@@ -503,31 +555,38 @@ class Property:
         return self.noi[date_]
 
     def get_cash_flows_df(self):
-        # Create the base DataFrame with dates and market value growth
-        df = pd.DataFrame(
-            list(zip(self.month_list, self.grow_market_value())),
-            columns=['date', 'market_value']
-        )
-
-        # Populate key financial events
-        df.loc[df.date == self.acquisition_date, 'acquisition_cost'] = self.acquisition_cost
-        df.loc[df.date == self.disposition_date, 'disposition_price'] = self.disposition_price
-        df.loc[df.date == self.partner_buyout_date, 'partner_buyout_cost'] = self.partner_buyout_cost
-        df.loc[df.date == self.partial_sale_date, 'partial_sale_proceeds'] = self.partial_sale_proceeds
-        df['foreclosure_market_value'] = 0
+        # Market value growth, plus one zero-filled column per key financial event
+        n = len(self.month_list)
+        market_values = np.asarray(self.get_market_values(), dtype=np.float64)
         foreclosure_market_value = self.get_foreclosure_market_value()
-        if foreclosure_market_value > 0:
-            df.loc[df.date == self.foreclosure_date, 'foreclosure_market_value'] = foreclosure_market_value
+        events = [
+            ('acquisition_cost', self.acquisition_date, self.acquisition_cost),
+            ('disposition_price', self.disposition_date, self.disposition_price),
+            ('partner_buyout_cost', self.partner_buyout_date, self.partner_buyout_cost),
+            ('partial_sale_proceeds', self.partial_sale_date, self.partial_sale_proceeds),
+            ('foreclosure_market_value', self.foreclosure_date, foreclosure_market_value if foreclosure_market_value > 0 else None),
+        ]
+        columns = {'date': self.month_list, 'market_value': market_values}
+        for column, event_date, amount in events:
+            values = np.zeros(n)
+            # Each event lands on at most one month, found by position rather than by scanning the dates
+            i = self._month_index.get(event_date)
+            if i is not None and amount is not None:
+                values[i] = amount
+            columns[column] = values
 
         # Populate cash flows from the stored dictionaries
-        df['noi'] = df['date'].map(self.noi).fillna(0)
-        df['capex'] = df['date'].map(self.capex).fillna(0)
+        noi = self._monthly_values('noi')
+        capex = self._monthly_values('capex')
+        noi = np.where(np.isnan(noi), 0.0, noi)
+        capex = np.where(np.isnan(capex), 0.0, capex)
 
         # Adjust NOI and Capex when either is 0
-        df.loc[df['noi'] == 0, 'noi'] = df['market_value'] * self.cap_rate / 12
-        df.loc[df['capex'] == 0, 'capex'] = df['market_value'] * self.cap_rate / 12 * self.capex_percent_of_noi
+        implied_noi = market_values * self.cap_rate / 12
+        columns['noi'] = np.where(noi == 0, implied_noi, noi)
+        columns['capex'] = np.where(capex == 0, implied_noi * self.capex_percent_of_noi, capex)
 
-        return df
+        return pd.DataFrame(columns)
 
     def add_loan(self, loan: Loan):
         if not isinstance(self.loans, dict):
@@ -601,8 +660,7 @@ class Property:
         else:
             self.check_loan_dates()
             loans_ = [loan.generate_loan_schedule_df() for loan in self.loans.values()]
-            df = pd.concat(loans_)
-            df = df.groupby('date').sum().reset_index()
+            df = sum_frames_by_date(loans_)
             df['encumbered'] = df['encumbered'] > 0
             #print(df)
             return df
@@ -613,45 +671,33 @@ class Property:
         else:
             self.check_loan_dates()
             loans_ = [loan.generate_loan_schedule_df() for loan in self.loans.values()]
-            df = pd.concat(loans_)
+            # A single schedule is already a fresh frame, so there is nothing to stack
+            df = loans_[0] if len(loans_) == 1 else pd.concat(loans_, ignore_index=True, sort=False)
             df['encumbered'] = df['encumbered'] > 0
 
-            ownership_series = pd.DataFrame(
-                list(self.generate_ownership_series().items()),
-                columns=['date', 'ownership_share']
-            )
-
-            # Ensure dates are `date` objects
-            df['date'] = df['date'].apply(lambda x: x.date() if isinstance(x, datetime) else x)
-            ownership_series['date'] = ownership_series['date'].apply(lambda x: x.date() if isinstance(x, datetime) else x)
+            # Look up each row's ownership share directly instead of merging on date
+            ownership = self.generate_ownership_series()
+            df['ownership_share'] = df['date'].map(ownership).fillna(0)
 
-            # Merge ownership series with cash flows
-            adjusted_cash_flows = df.merge(ownership_series, on='date', how='left')
-
-            exclude_columns = {'ownership_share'}
-
-            numeric_columns = adjusted_cash_flows.select_dtypes(include='number').columns
-            for col in numeric_columns:
-                if col not in exclude_columns:
-                    adjusted_cash_flows[col] *= adjusted_cash_flows['ownership_share']
+            # Scale every numeric column by the share in one broadcast multiply
+            numeric_columns = df.select_dtypes(include='number').columns.difference(['ownership_share'])
+            df[numeric_columns] = df[numeric_columns].to_numpy() * df['ownership_share'].to_numpy()[:, None]
 
             return df
 
     def combine_loan_cash_flows_df(self):
+        cash_flows = self.get_cash_flows_df()
         if len(self.loans) == 0:
-            cash_flows = self.get_cash_flows_df()
-            cash_flows['date'] = pd.to_datetime(cash_flows['date'])
             cash_flows['encumbered'] = False
         else:
-            cash_flows = self.get_cash_flows_df()
-            cash_flows['date'] = pd.to_datetime(cash_flows['date'])
             loan_cash_flows = self.combine_loan_schedules_df()
-            loan_cash_flows['date'] = pd.to_datetime(loan_cash_flows['date'])
             #loan_values = self.combine_loan_values_df()
-            #loan_values['date'] = pd.to_datetime(loan_values['date'])
-            cash_flows = cash_flows.merge(loan_cash_flows, on='date',how='left')
+            # Both frames are keyed by the same month-end dates, so align on the index rather than merging
+            cash_flows = cash_flows.set_index('date').join(loan_cash_flows.set_index('date'), how='left').reset_index()
             #cash_flows = cash_flows.merge(loan_values[['date','loan_value']], on='date', how='left')
             cash_flows['encumbered'] = cash_flows['encumbered']==True
+        # Convert the month-end dates to datetime64 once, after alignment
+        cash_flows['date'] = pd.to_datetime(cash_flows['date'])
         cash_flows.fillna(0, inplace=True)
         cash_flows['Property Name'] = self.name
         cash_flows['Property Type'] = self.property_type
@@ -664,11 +710,12 @@ class Property:
         cash_flows.loc[cash_flows['date'] == self.acquisition_date, 'gain_loss'] = 0
         return cash_flows
 
-    def calculate_effective_share(self, date_, nav):
-        df = self.promote_cash_flows.copy()
-        df['date'] = df['date'].apply(lambda x: ensure_end_of_month(x))
+    def calculate_effective_share(self, date_, nav, promote_cash_flows: Optional[pd.DataFrame] = None):
+        # promote_cash_flows: already month-end/float normalized flows, to skip preparing them again on every call
+        if promote_cash_flows is None:
+            promote_cash_flows = self._prepare_promote_cash_flows()
+        df = promote_cash_flows.copy()
         date_ = ensure_end_of_month(date_)
-        df['cash_flow'] = df['cash_flow'].astype(float)
         if date_ in df['date'].values:
             df.loc[df['date'] == date_, 'cash_flow'] += float(nav)
         else:
@@ -689,6 +736,13 @@ class Property:
 
         return lp_effective_share
 
+    def _prepare_promote_cash_flows(self):
+        """Promote cash flows with month-end dates and float amounts, as calculate_effective_share expects."""
+        df = self.promote_cash_flows.copy()
+        df['date'] = ensure_end_of_month_series(df['date'])
+        df['cash_flow'] = df['cash_flow'].astype(float)
+        return df
+
     def calculate_effective_shares(self):
         df = self.combine_loan_cash_flows_df()
         df['date'] = df['date'].apply(lambda x: ensure_end_of_month(x))
@@ -697,10 +751,12 @@ class Property:
         # Aggregate NAV by date to avoid duplicate processing
         aggregated = df.groupby('date')['nav'].sum().reset_index()
 
-        # Calculate effective share for each unique date
-        aggregated['effective_share'] = aggregated.apply(
-            lambda row: self.calculate_effective_share(row['date'], row['nav']), axis=1
-        )
+        # Calculate effective share for each unique date, preparing the promote flows once for all of them
+        promote_cash_flows = self._prepare_promote_cash_flows()
+        aggregated['effective_share'] = [
+            self.calculate_effective_share(date_, nav, promote_cash_flows)
+            for date_, nav in zip(aggregated['date'].tolist(), aggregated['nav'].tolist())
+        ]
 
         self.effective_shares = aggregated.set_index('date')['effective_share'].to_dict()
         return self.effective_shares
@@ -749,27 +805,23 @@ class Property:
                 event_date = ensure_end_of_month(event_date)
                 next_month = ensure_end_of_month(event_date + relativedelta(months=1))
 
-                if event_date in adjusted_cash_flows['date'].values and next_month in adjusted_cash_flows[
-                    'date'].values:
-                    ownership_share_event = adjusted_cash_flows.loc[
-                        adjusted_cash_flows['date'] == event_date, 'ownership_share'
-                    ].iloc[0]
-                    ownership_share_next = adjusted_cash_flows.loc[
-                        adjusted_cash_flows['date'] == next_month, 'ownership_share'
-                    ].iloc[0]
+                # Compare the date column once per event and read scalars straight from the NumPy arrays
+                dates = adjusted_cash_flows['date'].to_numpy()
+                event_mask = dates == event_date
+                next_mask = dates == next_month
+                if event_mask.any() and next_mask.any():
+                    ownership_shares = adjusted_cash_flows['ownership_share'].to_numpy()
+                    ownership_share_event = ownership_shares[event_mask][0]
+                    ownership_share_next = ownership_shares[next_mask][0]
 
-                    market_value_event = adjusted_cash_flows.loc[
-                        adjusted_cash_flows['date'] == event_date, 'market_value'
-                    ].iloc[0]
+                    market_value_event = adjusted_cash_flows['market_value'].to_numpy()[event_mask][0]
 
                     corrected_market_value = (
                         market_value_event / ownership_share_event * ownership_share_next
                         if ownership_share_event != 0 else 0
                     )
 
-                    adjusted_cash_flows.loc[
-                        adjusted_cash_flows['date'] == event_date, 'market_value'
-                    ] = corrected_market_value
+                    adjusted_cash_flows.loc[event_mask, 'market_value'] = corrected_market_value
         if self.promote:
             adjusted_cash_flows = self.calculate_income_and_gain_loss(adjusted_cash_flows)
         adjusted_cash_flows.loc[adjusted_cash_flows['ownership_share'] == 1, 'effective_share'] = 1.0
@@ -799,6 +851,7 @@ class Property:
             return pd.DataFrame(columns=['loan_id', 'date', 'loan_value','discount_rate'])
         else:
             loan_values = []
+            treasury_rates = build_treasury_rate_arrays(treasury_rates)
             for loan in self.loans.values():
                 for month_ in self.month_list:
                     loan_value = loan.value_loan(month_, treasury_rates, chatham_style)
@@ -863,6 +916,9 @@ class Property:
         return next_twelve_noi / 0.05
 
     def calculate_property_irr(self, disposition_date=None):
+        # Only the IRR search needs numpy_financial, so keep it off the module import path
+        import numpy_financial as npf
+
         if disposition_date is None:
             disposition_date = self.disposition_date
         disposition_index = self.month_list.index(disposition_date)
@@ -5,10 +5,18 @@ This module consolidates date handling logic that was previously duplicated
 across multiple files (Property.py, Portfolio.py, Loan.py, PreferredEquity.py).
 """
 
+import numpy as np
 import pandas as pd
 from datetime import date, datetime
 from calendar import monthrange
-from typing import Optional
+from functools import lru_cache, reduce
+from typing import Iterable, Optional
+
+
+@lru_cache(maxsize=4096)
+def _month_end(year: int, month: int) -> date:
+    """Return the last day of the given month, memoized since analyses reuse few distinct months."""
+    return date(year, month, monthrange(year, month)[1])
 
 
 def ensure_end_of_month(input_date) -> Optional[date]:
@@ -35,6 +43,10 @@ def ensure_end_of_month(input_date) -> Optional[date]:
         >>> ensure_end_of_month(None)
         None
     """
+    # Fast path for the common case: a plain date skips the NaN and type checks
+    if type(input_date) is date:
+        return _month_end(input_date.year, input_date.month)
+
     # Handle NaN, NaT, or None
     if input_date is None or pd.isna(input_date):
         return None
@@ -48,8 +60,40 @@ def ensure_end_of_month(input_date) -> Optional[date]:
         raise ValueError(f"Invalid date format: {input_date}")
 
     # Ensure the date is the last day of the month
-    last_day = monthrange(input_date.year, input_date.month)[1]
-    return input_date.replace(day=last_day)
+    return _month_end(input_date.year, input_date.month)
+
+
+def ensure_end_of_month_series(dates: pd.Series) -> pd.Series:
+    """
+    Vectorized ensure_end_of_month for a whole column.
+
+    Rolls every value forward to its month-end with one datetime64 offset instead of a
+    Python call per cell.
+
+    Args:
+        dates: Series of date, datetime, or pd.Timestamp values (NaN/None allowed)
+
+    Returns:
+        Object Series of date values, with None where the input was missing
+    """
+    month_ends = pd.to_datetime(dates) + pd.offsets.MonthEnd(0)
+    # An all-missing column comes back from .dt.date as datetime64, so force object before filling None
+    return month_ends.dt.date.astype(object).where(month_ends.notna(), None)
+
+
+def month_end_list(start_date: date, num_months: int) -> list:
+    """
+    Month-end dates for `num_months` consecutive months starting with the month of `start_date`.
+
+    Uses integer month arithmetic and the cached month-end lookup rather than a
+    relativedelta addition per month.
+
+    Examples:
+        >>> month_end_list(date(2023, 11, 15), 3)
+        [date(2023, 11, 30), date(2023, 12, 31), date(2024, 1, 31)]
+    """
+    first_month = start_date.year * 12 + start_date.month - 1
+    return [_month_end(month // 12, month % 12 + 1) for month in range(first_month, first_month + num_months)]
 
 
 def validate_date(input_date) -> bool:
@@ -89,3 +133,62 @@ def convert_to_date(input_date) -> Optional[date]:
         return input_date
     else:
         raise ValueError(f"Invalid date format: {input_date}")
+
+
+def sum_frames_by_date(frames: Iterable[pd.DataFrame], date_column: str = 'date',
+                       numeric_only: bool = False) -> pd.DataFrame:
+    """
+    Sum date-keyed schedules column by column, aligned on the date column.
+
+    Equivalent to ``pd.concat(frames).groupby(date_column).sum().reset_index()``, but
+    accumulates every schedule straight into one preallocated date-by-column matrix
+    instead of building the stacked intermediate and hashing it. Dates missing from a
+    frame count as zero.
+
+    Args:
+        frames: Schedules to combine
+        date_column: Name of the date column to align on
+        numeric_only: Drop text columns instead of concatenating them as groupby-sum would
+
+    Returns:
+        DataFrame with one row per date, sorted by date
+    """
+    frames = list(frames)
+    columns = list(dict.fromkeys(
+        column for frame in frames for column in frame.columns if column != date_column
+    ))
+    numeric_columns = [
+        column for column in columns
+        if all(pd.api.types.is_numeric_dtype(frame[column]) for frame in frames if column in frame.columns)
+    ]
+    text_columns = [] if numeric_only else [column for column in columns if column not in numeric_columns]
+
+    # Row positions come from a binary search against the sorted union of dates
+    dates = np.unique(np.concatenate([frame[date_column].to_numpy() for frame in frames]))
+    positions = {column: i for i, column in enumerate(numeric_columns)}
+    totals = np.zeros((len(dates), len(numeric_columns)))
+    for frame in frames:
+        present = [column for column in numeric_columns if column in frame.columns]
+        rows = np.searchsorted(dates, frame[date_column].to_numpy())
+        values = frame[present].to_numpy(dtype=np.float64, na_value=0.0)
+        # bincount sums each column's values into its date rows, accumulating repeated dates
+        for j, column in enumerate(present):
+            totals[:, positions[column]] += np.bincount(rows, weights=values[:, j], minlength=len(dates))
+
+    combined = pd.DataFrame(totals, columns=numeric_columns)
+    # Whole-number and boolean columns sum to integer counts, as they do under groupby-sum
+    integer_columns = [
+        column for column in numeric_columns
+        if all(pd.api.types.is_integer_dtype(frame[column]) or pd.api.types.is_bool_dtype(frame[column])
+               for frame in frames if column in frame.columns)
+    ]
+    combined = combined.astype({column: 'int64' for column in integer_columns})
+    combined.insert(0, date_column, dates)
+
+    if text_columns:
+        # Collapse each frame to one row per date first so repeated dates align under add
+        parts = [frame.groupby(date_column)[[column for column in text_columns if column in frame.columns]].sum()
+                 for frame in frames]
+        text = reduce(lambda total, part: total.add(part, fill_value=''), parts)
+        combined = combined.join(text, on=date_column)
+    return combined[[date_column] + (numeric_columns if numeric_only else columns)]
@@ -0,0 +1,134 @@
+import importlib.util
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+import pytest
+
+# The library modules import each other as `portfolio_manager.*`, so load this checkout under that
+# package name whatever the directory is called.
+TESTS_DIR = os.path.abspath(os.path.dirname(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(TESTS_DIR, '..'))
+
+if 'portfolio_manager' not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        'portfolio_manager', os.path.join(REPO_ROOT, '__init__.py'), submodule_search_locations=[REPO_ROOT]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules['portfolio_manager'] = package
+    spec.loader.exec_module(package)
+
+from portfolio_manager.CarriedInterest import TierParams  # noqa: E402
+from portfolio_manager.Portfolio import Portfolio  # noqa: E402
+
+
+def month_ends(start, periods):
+    return list(pd.date_range(start, periods=periods, freq='ME').date)
+
+
+PROPERTY_ROWS = [
+    dict(id='1', name='Alpha', property_type='Office', acquisition_date=date(2023, 12, 15),
+         disposition_date=date(2028, 6, 30), acquisition_cost=10e6, disposition_price=12e6, address='1 Main',
+         city='Austin', state='TX', zipcode=78701, building_size=1000, market_value=10e6,
+         analysis_date=date(2023, 12, 31), analysis_length=60, market_value_growth=0.03, ownership=0.8,
+         construction_end=None, equity_commitment=None, partner_buyout_cost=500000,
+         partner_buyout_date=date(2025, 3, 31), partner_buyout_percent=0.1, partial_sale_date=None,
+         partial_sale_percent=0, partial_sale_proceeds=0, encumbered=True, cap_rate=0.06, exit_cap_rate=0.065,
+         capex_percent_of_noi=0.1, promote=True, upper_tier_share=0.9),
+    dict(id='2', name='Beta', property_type='Retail', acquisition_date=date(2024, 3, 10),
+         disposition_date=date(2026, 9, 30), acquisition_cost=5e6, disposition_price=6e6, address='2 Main',
+         city='Austin', state='TX', zipcode=78701, building_size=500, market_value=5e6,
+         analysis_date=date(2023, 12, 31), analysis_length=60, market_value_growth=0.02, ownership=1.0,
+         construction_end=date(2024, 12, 31), equity_commitment=1e6, partner_buyout_cost=0,
+         partner_buyout_date=None, partner_buyout_percent=0, partial_sale_date=date(2025, 6, 30),
+         partial_sale_percent=0.25, partial_sale_proceeds=1.5e6, encumbered=False, cap_rate=0.07,
+         exit_cap_rate=0.075, capex_percent_of_noi=0.05, promote=False, upper_tier_share=None),
+]
+
+LOAN_ROW = dict(id='L1', property_id='1', loan_amount=6e6, rate=0.05, fund_date=date(2023, 12, 31),
+                maturity_date=date(2028, 12, 31), payment_type='Actual/360', interest_only_periods=12,
+                amortizing_periods=360, commitment=7e6, prepayment_date=None, foreclosure_date=None,
+                market_rate=0.055, fixed_floating='Fixed')
+
+UNSECURED_LOAN_ROW = dict(id='U1', loan_amount=1e6, rate=0.07, fund_date=date(2024, 1, 31),
+                          maturity_date=date(2027, 1, 31), payment_type='Actual/365', interest_only_periods=36,
+                          amortizing_periods=0, commitment=3e6, prepayment_date=None, foreclosure_date=None,
+                          market_rate=0.065, fixed_floating='Floating')
+
+
+def _cash_flow_rows():
+    rows = []
+    for property_id, base in [('1', 50000), ('2', 30000)]:
+        for i, month in enumerate(month_ends('2023-12-01', 60)):
+            rows.append(dict(id=property_id, date=month, cash_flow='noi', amount=base + 100 * i))
+            rows.append(dict(id=property_id, date=month, cash_flow='capex', amount=1000 + 10 * i))
+    return rows
+
+
+def _capital_flow_rows():
+    rows = []
+    for i, month in enumerate(month_ends('2024-01-01', 36)):
+        if i % 6 == 0:
+            rows.append(dict(date=month, cash_flow='capital call', amount=100000))
+        if i % 3 == 2:
+            rows.append(dict(date=month, cash_flow='distribution', amount=20000))
+    return rows
+
+
+@pytest.fixture
+def property_rows():
+    return [dict(row) for row in PROPERTY_ROWS]
+
+
+@pytest.fixture
+def write_workbook(tmp_path):
+    """Write an import workbook with every sheet load_data reads; `properties` replaces the Properties rows."""
+    def write(properties=None):
+        path = tmp_path / 'portfolio.xlsx'
+        sheets = {
+            'Properties': pd.DataFrame(properties if properties is not None else PROPERTY_ROWS),
+            'Cash Flows': pd.DataFrame(_cash_flow_rows()),
+            'Secured Loans': pd.DataFrame([LOAN_ROW]),
+            'Unsecured Loans': pd.DataFrame([UNSECURED_LOAN_ROW]),
+            'Unsecured Loan Flows': pd.DataFrame([dict(id='U1', flow_type='draw', date=date(2024, 6, 15), amount=500000)]),
+            'Capital Flows': pd.DataFrame(_capital_flow_rows()),
+            'Preferred Equity': pd.DataFrame(columns=['id', 'property_id', 'loan_id', 'ownership_share']),
+            'Promotes': pd.DataFrame([dict(property_id='1', tier_number=1, hurdle_rate=0.08, lp_distribution=0.9,
+                                           property_id_='1', date=date(2023, 12, 31), cash_flow=-8e6)]),
+        }
+        with pd.ExcelWriter(path) as writer:
+            for sheet_name, df in sheets.items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def make_portfolio():
+    """Build a small two-property portfolio with a promote, secured and unsecured loans, capital flows and a fee."""
+    def build(fee=0.01):
+        portfolio = Portfolio(date(2024, 1, 31), date(2026, 12, 31), initial_unfunded_equity=5_000_000)
+        portfolio.load_properties(pd.DataFrame(PROPERTY_ROWS))
+
+        portfolio.load_cash_flows(pd.DataFrame(_cash_flow_rows()))
+        portfolio.load_property_loans(pd.DataFrame([LOAN_ROW]))
+        portfolio.load_unsecured_loans(pd.DataFrame([UNSECURED_LOAN_ROW]))
+        for property in portfolio.properties.values():
+            property.calculate_unfunded_equity()
+
+        promoted = portfolio.get_property('1')
+        promoted.add_promote_tier(TierParams(lp_dist_ratio=0.9, hurdle_rate=0.08))
+        promoted.add_promote_tier(TierParams(lp_dist_ratio=0.7, hurdle_rate=0.12))
+        promoted.add_promote_cash_flows(pd.DataFrame({'date': [date(2023, 12, 31)], 'cash_flow': [-8e6]}))
+
+        portfolio.load_capital_flows(pd.DataFrame(_capital_flow_rows()))
+        portfolio.calculate_unfunded_commitments()
+
+        portfolio.set_fee(fee)
+        portfolio.set_beginning_cash(250000)
+        portfolio.set_beginning_nav(1e7)
+        return portfolio
+
+    return build
@@ -0,0 +1,64 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from portfolio_manager.date_utils import ensure_end_of_month_series, sum_frames_by_date
+
+
+def month_ends(start, periods):
+    return list(pd.date_range(start, periods=periods, freq='ME').date)
+
+
+def _schedule(rng, start, periods, label):
+    dates = month_ends(start, periods)
+    return pd.DataFrame({
+        'date': dates,
+        'interest_payment': rng.uniform(0, 5e4, periods).round(2),
+        'loan_draw': np.where(rng.random(periods) < 0.2, np.nan, rng.uniform(0, 1e5, periods)),
+        'periods': np.arange(periods, dtype=np.int64),
+        'encumbered': rng.random(periods) < 0.5,
+        'fixed_floating': label,
+    })
+
+
+@pytest.mark.parametrize('numeric_only', [False, True])
+def test_sum_frames_by_date_matches_concat_groupby(numeric_only):
+    rng = np.random.default_rng(7)
+    frames = [
+        _schedule(rng, '2024-01-01', 24, 'Fixed'),
+        _schedule(rng, '2024-07-01', 36, 'Floating'),
+        # A repeated month within one frame is summed into the same row
+        pd.concat([_schedule(rng, '2023-10-01', 6, 'Fixed'), _schedule(rng, '2024-01-01', 1, 'Fixed')],
+                  ignore_index=True),
+    ]
+    expected = pd.concat(frames).groupby('date').sum(numeric_only=numeric_only).reset_index()
+
+    pd.testing.assert_frame_equal(sum_frames_by_date(frames, numeric_only=numeric_only), expected,
+                                  check_exact=False, rtol=1e-12)
+
+
+def test_sum_frames_by_date_treats_missing_columns_as_zero():
+    first = pd.DataFrame({'date': month_ends('2024-01-01', 3), 'noi': [1.0, 2.0, 3.0]})
+    second = pd.DataFrame({'date': month_ends('2024-02-01', 3), 'capex': [10.0, 20.0, 30.0]})
+
+    result = sum_frames_by_date([first, second])
+
+    assert result['date'].tolist() == month_ends('2024-01-01', 4)
+    assert result['noi'].tolist() == [1.0, 2.0, 3.0, 0.0]
+    assert result['capex'].tolist() == [0.0, 10.0, 20.0, 30.0]
+
+
+@pytest.mark.parametrize('missing', [None, np.nan, pd.NaT])
+def test_ensure_end_of_month_series_returns_none_for_an_all_missing_column(missing):
+    result = ensure_end_of_month_series(pd.Series([missing, missing]))
+
+    assert result.dtype == object
+    assert result.tolist() == [None, None]
+
+
+def test_ensure_end_of_month_series_rolls_dates_to_month_end():
+    result = ensure_end_of_month_series(pd.Series([date(2024, 2, 3), None, pd.Timestamp('2024-12-31')]))
+
+    assert result.tolist() == [date(2024, 2, 29), None, date(2024, 12, 31)]
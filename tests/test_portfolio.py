@@ -0,0 +1,218 @@
+import logging
+from datetime import date
+
+import numpy as np
+import pytest
+
+import portfolio_manager.Portfolio as portfolio_module
+from portfolio_manager.Loan import Loan
+from portfolio_manager.Portfolio import Portfolio
+from portfolio_manager.PreferredEquity import PreferredEquity
+
+
+def _roll_forward_with_loop(report, initial_cash, fee):
+    """Reference per-row cash roll-forward, as the report computed it before the array rewrite."""
+    beginning_cash, ending_cash, management_fee, net_asset_value = [initial_cash], [initial_cash], [np.nan], [np.nan]
+    for i in range(1, len(report)):
+        beginning = ending_cash[-1]
+        provisional_ending_cash = beginning + report['Net Cash Flow'].iat[i]
+        nav_before_fee = report['market_value'].iat[i] - report['ending_balance'].iat[i] + provisional_ending_cash
+        fee_ = nav_before_fee * fee / 4 if report['date'].iat[i].month % 3 == 1 else 0
+        beginning_cash.append(beginning)
+        ending_cash.append(provisional_ending_cash - fee_)
+        management_fee.append(fee_)
+        net_asset_value.append(report['market_value'].iat[i] - report['ending_balance'].iat[i] + ending_cash[-1])
+    return np.array(beginning_cash), np.array(ending_cash), np.array(management_fee), np.array(net_asset_value)
+
+
+@pytest.mark.parametrize('fee', [0.0, 0.01, 4.0])
+def test_cash_roll_forward_matches_per_row_loop(make_portfolio, fee):
+    # A 400% annual fee takes the whole quarter-start NAV, which the earlier closed form could not divide through
+    report = make_portfolio(fee=fee).get_portfolio_cash_flows_share_df()
+    beginning_cash, ending_cash, management_fee, net_asset_value = _roll_forward_with_loop(report, 250000, fee)
+
+    # The first row is zeroed for reporting, with NAV reset to the beginning NAV
+    np.testing.assert_allclose(report['ending_cash'], ending_cash, rtol=1e-12)
+    np.testing.assert_allclose(report['beginning_cash'].iloc[1:], beginning_cash[1:], rtol=1e-12)
+    np.testing.assert_allclose(report['management_fee'].iloc[1:], management_fee[1:], rtol=1e-12)
+    np.testing.assert_allclose(report['net_asset_value'].iloc[1:], net_asset_value[1:], rtol=1e-12)
+    assert np.isfinite(report['ending_cash']).all()
+
+
+def test_cash_roll_forward_warns_once_per_negative_period(make_portfolio, caplog):
+    portfolio = make_portfolio()
+    with caplog.at_level(logging.WARNING):
+        report = portfolio.get_portfolio_cash_flows_share_df()
+
+    warned = [record.getMessage() for record in caplog.records if 'Cash is negative' in record.getMessage()]
+    negative = np.flatnonzero(report['ending_cash'].to_numpy()[1:] < 0) + 1
+    assert len(negative) > 0
+    assert warned == [f"Warning: Cash is negative in period {i + 1}: ${report['ending_cash'].iat[i]:,.0f}. "
+                      f"Consider a revolver draw or capital call." for i in negative]
+
+
+def test_read_import_file_picks_up_workbook_edits(write_workbook, property_rows):
+    path = write_workbook()
+    portfolio = Portfolio(date(2024, 1, 31), date(2026, 12, 31))
+    portfolio.set_file_path(path)
+    portfolio.load_data()
+    assert portfolio.get_property('1').name == 'Alpha'
+
+    write_workbook(properties=[dict(row, name=row['name'] + ' II') for row in property_rows])
+    assert portfolio.read_import_file('Properties')['name'].tolist() == ['Alpha II', 'Beta II']
+
+
+def test_read_import_file_keeps_whole_dollar_columns_int64(write_workbook):
+    portfolio = Portfolio(date(2024, 1, 31), date(2026, 12, 31))
+    portfolio.set_file_path(write_workbook())
+
+    cash_flows = portfolio.read_import_file('Cash Flows')
+    assert cash_flows['amount'].dtype == np.int64
+    assert (cash_flows['amount'] * 10 ** 6).max() > np.iinfo(np.int32).max
+
+
+def test_share_report_reflects_changes_made_outside_portfolio_setters(make_portfolio):
+    portfolio = make_portfolio()
+    report = portfolio.get_portfolio_cash_flows_share_df()
+
+    property = portfolio.get_property('2')
+    property.update_noi({month: amount + 1e6 for month, amount in property.noi.items()})
+    first_call = report['date'].iat[3]
+    portfolio.capital_calls[first_call] = portfolio.capital_calls.get(first_call, 0) + 250000
+    updated = portfolio.get_portfolio_cash_flows_share_df()
+
+    assert updated['noi'].sum() > report['noi'].sum() + 1e6
+    assert updated['capital_calls'].sum() == report['capital_calls'].sum() + 250000
+    assert updated['unfunded_commitment'].iat[-1] == report['unfunded_commitment'].iat[-1] - 250000
+
+
+def test_load_data_accepts_an_all_empty_date_column(write_workbook, property_rows):
+    for row in property_rows:
+        row.update(partner_buyout_date=None, partial_sale_date=None, construction_end=None)
+    portfolio = Portfolio(date(2024, 1, 31), date(2026, 12, 31))
+    portfolio.set_file_path(write_workbook(properties=property_rows))
+    portfolio.load_data()
+
+    property = portfolio.get_property('2')
+    assert property.partial_sale_date is None
+    assert property.construction_end is None
+    for property in portfolio.properties.values():
+        assert not property.adjust_cash_flows_by_ownership_df().empty
+    assert not portfolio.get_portfolio_cash_flows_share_df().empty
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class _FakeSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        if 'stlouisfed' in url:
+            return _FakeResponse({'observations': [{'date': '2024-01-31', 'value': '4.25'},
+                                                   {'date': '2024-02-29', 'value': '.'}]})
+        return _FakeResponse({'Rates': [{'Date': '2030-06-15T00:00:00', 'Rate': 0.0425}]})
+
+
+def test_treasury_rate_cache_is_opt_in_and_round_trips_as_json(tmp_path, monkeypatch):
+    monkeypatch.setenv('FRED_API_KEY', 'test')
+    monkeypatch.setattr(portfolio_module, 'TREASURY_CACHE_DIR', str(tmp_path))
+    expected = {date(2024, 1, 31): 0.0425, date(2030, 6, 30): 0.0425}
+
+    portfolio = Portfolio(date(2024, 1, 31), date(2026, 12, 31))
+    portfolio._http = _FakeSession()
+    portfolio.fetch_treasury_rates()
+    assert list(tmp_path.iterdir()) == []
+
+    portfolio.fetch_treasury_rates(use_cache=True)
+    [cache_file] = tmp_path.iterdir()
+    assert cache_file.suffix == '.json'
+
+    cached = Portfolio(date(2024, 1, 31), date(2026, 12, 31))
+    cached._http = _FakeSession()
+    cached.fetch_treasury_rates(use_cache=True)
+    assert cached._http.calls == 0
+    assert {day: cached.treasury_rates[day] for day in expected} == pytest.approx(expected)
+
+    cached.fetch_treasury_rates(series_id='DGS5', use_cache=True)
+    assert cached._http.calls == 2
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_loan_schedules_reflect_draws_made_directly_on_the_loan(make_portfolio):
+    portfolio = make_portfolio()
+    before = portfolio.concat_loan_schedules_df()
+
+    drawn = portfolio.get_loan('U1').add_loan_draw(250000, date(2025, 6, 30))
+    after = portfolio.concat_loan_schedules_df()
+
+    assert drawn == 250000
+    assert after['loan_draw'].sum() == before['loan_draw'].sum() + 250000
+
+
+def test_property_loan_reports_reflect_draws_made_directly_on_the_loan(make_portfolio):
+    portfolio = make_portfolio()
+    as_of_date = date(2024, 12, 31)
+    loans = portfolio.concat_property_loans()
+    values = portfolio.value_property_loans(as_of_date, 0.01)
+
+    loan = portfolio.get_property('1').loans['L1']
+    assert loan.add_loan_draw(500000, date(2024, 6, 30)) == 500000
+
+    assert portfolio.concat_property_loans()['loan_draw'].sum() == loans['loan_draw'].sum() + 500000
+    updated = portfolio.value_property_loans(as_of_date, 0.01)
+    assert updated['Current Balance'].iat[0] == pytest.approx(values['Current Balance'].iat[0] + 500000)
+
+
+def test_property_loans_include_a_loan_added_directly_to_the_property(make_portfolio):
+    portfolio = make_portfolio()
+    assert set(portfolio.concat_property_loans()['loan_id']) == {'L1'}
+
+    portfolio.get_property('2').add_loan(Loan('L2', 2e6, 0.06, date(2024, 3, 31), date(2029, 3, 31), 'Actual/360', property_id='2'))
+
+    assert set(portfolio.concat_property_loans()['loan_id']) == {'L1', 'L2'}
+
+
+def test_treasury_rate_arrays_follow_in_place_rate_edits():
+    portfolio = Portfolio(date(2024, 1, 31), date(2026, 12, 31))
+    portfolio.treasury_rates.update({date(2024, 1, 31): 0.04, date(2024, 2, 29): 0.045})
+    _, rates = portfolio.get_treasury_rate_arrays()
+    assert rates.tolist() == [0.04, 0.045]
+
+    portfolio.treasury_rates[date(2024, 2, 29)] = 0.05
+    _, rates = portfolio.get_treasury_rate_arrays()
+    assert rates.tolist() == [0.04, 0.05]
+
+
+def test_preferred_equity_schedule_keeps_label_columns_as_text():
+    loan = Loan('P1', 3e6, 0.1, date(2024, 1, 31), date(2027, 1, 31), 'Actual/360', interest_only_periods=36)
+    schedule = PreferredEquity('PE1', loan).generate_preferred_equity_schedule_df()
+
+    assert schedule['Property Name'].dtype == object
+    assert schedule['Property Type'].dtype == object
+    assert set(schedule['Property Type']) == {'Preferred Equity'}
+
+
+def test_balance_as_of_finds_the_scheduled_balance_or_warns(caplog):
+    loan = Loan('L9', 1e6, 0.05, date(2024, 1, 31), date(2024, 6, 30), 'Actual/360')
+    schedule = loan.generate_loan_schedule_df()
+
+    for as_of_date, balance in zip(schedule['date'].iloc[:-1], schedule['ending_balance'].iloc[:-1]):
+        assert Portfolio._balance_as_of(loan, schedule, as_of_date) == balance
+
+    with caplog.at_level(logging.WARNING):
+        assert Portfolio._balance_as_of(loan, schedule, date(2024, 6, 30)) is None
+        assert Portfolio._balance_as_of(loan, schedule.drop(index=2), schedule['date'].iat[2]) is None
+    assert [record.getMessage() for record in caplog.records] == [
+        'L9: Loan cash flows end before as of date.',
+        f"L9: No scheduled balance on {schedule['date'].iat[2]}.",
+    ]
@@ -0,0 +1,126 @@
+from datetime import date
+
+import numpy as np
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from portfolio_manager.date_utils import ensure_end_of_month
+from portfolio_manager.Loan import Loan
+
+
+def _market_values_with_loop(property):
+    """Reference month-by-month valuation, as grow_market_value computed it before the array rewrite."""
+    growth_rate = (1 + property.market_value_growth) ** (1 / 12)
+    construction_finished = (property.construction_end is None) or (property.construction_end < property.analysis_date)
+    market_values = []
+    current_value = property.market_value
+    for idx, month in enumerate(property.month_list):
+        if month == property.acquisition_date:
+            current_value = property.acquisition_cost
+        elif idx == 0:
+            pass
+        elif month >= property.disposition_date:
+            current_value = 0
+        elif property.valuation_method == 'cap_rate' and construction_finished:
+            fraction = min(idx / 120, 1)
+            cap_rate = property.cap_rate + fraction * (property.exit_cap_rate - property.cap_rate)
+            forward_noi, start_date = 0, month
+            for _ in range(12):
+                next_month = ensure_end_of_month(start_date + relativedelta(months=1))
+                forward_noi += sum(value for date_, value in property.noi.items() if start_date <= date_ < next_month)
+                start_date = next_month
+            current_value = forward_noi / cap_rate
+        else:
+            capex = 0
+            if not construction_finished and property.construction_end and month <= property.construction_end:
+                capex = property.capex.get(month, 0)
+            current_value = current_value * growth_rate + capex
+        market_values.append(current_value)
+    return market_values
+
+
+@pytest.mark.parametrize('valuation_method', ['growth', 'cap_rate'])
+@pytest.mark.parametrize('property_id', ['1', '2'])
+def test_grow_market_value_matches_monthly_loop(make_portfolio, property_id, valuation_method):
+    # Property '1' is valued from day one; '2' is acquired mid-analysis, under construction and partially sold
+    property = make_portfolio().get_property(property_id)
+    property.set_valuation_method(valuation_method)
+
+    expected = _market_values_with_loop(property)
+    np.testing.assert_allclose(property.grow_market_value(), expected, rtol=1e-12)
+    assert property.get_market_values() == property.grow_market_value()
+
+
+def test_grow_market_value_resets_at_acquisition_and_zeroes_after_disposition(make_portfolio):
+    property = make_portfolio().get_property('2')
+    values = dict(zip(property.month_list, property.grow_market_value()))
+
+    assert values[property.acquisition_date] == property.acquisition_cost
+    assert all(value == 0 for month, value in values.items() if month >= property.disposition_date)
+
+
+def test_market_values_follow_noi_setter_edits(make_portfolio):
+    property = make_portfolio().get_property('1')
+    property.set_valuation_method('cap_rate')
+    before = property.get_market_values()
+
+    month = property.month_list[6]
+    property.update_noi_by_date(month, property.noi[month] + 1e6)
+
+    assert property.get_market_values() != before
+    assert property.get_market_values() == _market_values_with_loop(property)
+
+
+def test_cash_flows_follow_in_place_dict_edits_and_market_values_follow_setters(make_portfolio):
+    property = make_portfolio().get_property('2')
+    cash_flows = property.get_cash_flows_df()
+    market_values = property.get_market_values()
+
+    month = property.month_list[6]
+    property.noi[month] += 1e6
+    property.capex[month] += 1e6
+    updated = property.get_cash_flows_df()
+
+    assert updated['noi'].sum() == pytest.approx(cash_flows['noi'].sum() + 1e6)
+    assert updated['capex'].sum() == pytest.approx(cash_flows['capex'].sum() + 1e6)
+
+    # Construction capex is added to the value once the edit goes through the setter
+    property.update_capex_by_date(month, property.capex[month])
+    assert property.get_market_values() != market_values
+    np.testing.assert_allclose(property.get_market_values(), _market_values_with_loop(property), rtol=1e-12)
+
+
+def test_market_value_lookups_reuse_the_memo_until_an_input_changes(make_portfolio, monkeypatch):
+    property = make_portfolio().get_property('1')
+    property.get_market_values()
+    calls = []
+    grow_market_value = property.grow_market_value
+    monkeypatch.setattr(property, 'grow_market_value', lambda: calls.append(1) or grow_market_value())
+
+    month = property.month_list[12]
+    value = property.get_market_value_by_date(month)
+    property.get_cash_flows_df()
+    assert calls == []
+
+    property.set_valuation_method('cap_rate')
+    assert property.get_market_value_by_date(month) != value
+    assert property.get_market_value_by_date(month) == _market_values_with_loop(property)[12]
+    assert calls == [1]
+
+
+@pytest.mark.parametrize('equity_commitment', [None, np.nan])
+def test_loans_cover_construction_deficits_without_an_equity_commitment(make_portfolio, equity_commitment):
+    property = make_portfolio().get_property('2')
+    property.equity_commitment = equity_commitment
+    property.add_loan(Loan('L2', 1e6, 0.06, date(2024, 3, 31), date(2029, 3, 31), 'Actual/360',
+                           property_id='2', commitment=3e6))
+    deficit_months = property.month_list[6:9]
+    for month in deficit_months:
+        property.update_capex_by_date(month, property.noi[month] + 69000)
+
+    unfunded = property.calculate_unfunded_equity()
+
+    assert unfunded == [0.0] * len(property.month_list)
+    draws = property.loans['L2'].loan_draws
+    assert [draws[month] for month in deficit_months] == [69000.0] * 3
+    assert sum(draws.values()) == 207000.0